@@ -1,18 +1,127 @@
-from backend.mongodb_service.app.models.data_models import RegisterComplaint, ComplaintStatus
-from backend.mongodb_service.app.core.config import url_mongodb_service
+from backend.mongodb_service.app.models.data_models import RegisterComplaint, ComplaintStatus, ComplaintStatusBatch
+from backend.mongodb_service.app.core.config import (
+    url_mongodb_service,
+    api_client_timeout,
+    api_client_retries,
+    api_client_max_connections,
+)
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import httpx
 import requests
 
+
+def _body(payload):
+    if isinstance(payload, BaseModel):
+        return payload.model_dump()
+    return payload
+
+
+# -------------------------------------------------------
+# Sync client – one keep-alive session per Api instance
+# -------------------------------------------------------
 class Api:
-    def __init__(self, base_url= url_mongodb_service):
+    def __init__(self, base_url= url_mongodb_service, timeout=api_client_timeout, retries=api_client_retries):
         self.base_url = base_url
+        self.timeout = timeout
+
+        # Only connection-level failures are retried, so a POST never
+        # runs twice on the server.
+        adapter = HTTPAdapter(
+            pool_maxsize=api_client_max_connections,
+            max_retries=Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=0.2),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def register_complaints(self, payload: RegisterComplaint):
         print(payload)
         url = f"{self.base_url}/register-complaint-mongodb/"
-        response = requests.post(url, json=payload, timeout=5)
+        response = self.session.post(url, json=_body(payload), timeout=self.timeout)
         return response.json()
 
     def check_status(self, payload: ComplaintStatus):
         url = f"{self.base_url}/check-complaint-status-mongodb/"
-        response = requests.post(url, json=payload, timeout=5)
+        response = self.session.post(url, json=_body(payload), timeout=self.timeout)
+        return response.json()
+
+    def check_status_batch(self, payload: ComplaintStatusBatch):
+        url = f"{self.base_url}/check-complaint-status-batch/"
+        response = self.session.post(url, json=_body(payload), timeout=self.timeout)
         return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+# -------------------------------------------------------
+# Async client – for callers running on an event loop
+# (chat service). Instances with the same timeout / retries
+# share one pooled client.
+# -------------------------------------------------------
+class AsyncApi:
+    # (timeout, retries) -> client; retries live on the transport, so
+    # instances configured differently can't share a client
+    _clients: dict[tuple, httpx.AsyncClient] = {}
+
+    def __init__(self, base_url= url_mongodb_service, timeout=api_client_timeout, retries=api_client_retries):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+
+    def _get_client(self) -> httpx.AsyncClient:
+        key = (self.timeout, self.retries)
+        client = AsyncApi._clients.get(key)
+        if client is None or client.is_closed:
+            client = AsyncApi._clients[key] = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=api_client_max_connections,
+                    max_keepalive_connections=api_client_max_connections,
+                ),
+                # connect failures only – see Api
+                transport=httpx.AsyncHTTPTransport(retries=self.retries),
+            )
+        return client
+
+    async def _post(self, path: str, payload):
+        response = await self._get_client().post(
+            f"{self.base_url}{path}", json=_body(payload), timeout=self.timeout
+        )
+        return response.json()
+
+    async def register_complaints(self, payload: RegisterComplaint):
+        return await self._post("/register-complaint-mongodb/", payload)
+
+    async def check_status(self, payload: ComplaintStatus):
+        return await self._post("/check-complaint-status-mongodb/", payload)
+
+    async def check_status_batch(self, payload: ComplaintStatusBatch):
+        return await self._post("/check-complaint-status-batch/", payload)
+
+    async def check_status_many(self, payloads, concurrency: int = 10):
+        """
+        Status of many complaints, at most `concurrency` requests in flight.
+        Results come back in input order; a failed call yields
+        {"error": "..."} in its slot instead of raising.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(payload):
+            async with semaphore:
+                try:
+                    return await self.check_status(payload)
+                except (httpx.HTTPError, ValueError) as exc:
+                    # ValueError: a non-JSON body, e.g. a proxy's HTML 502
+                    return {"error": str(exc)}
+
+        return await asyncio.gather(*(one(p) for p in payloads))
+
+    @classmethod
+    async def aclose(cls):
+        clients, cls._clients = cls._clients, {}
+        for client in clients.values():
+            await client.aclose()
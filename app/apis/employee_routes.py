@@ -1,8 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import orjson
+from pydantic import BaseModel, Field
 from backend.mongodb_service.app.mongodb.db_connections import employees_col
-from backend.mongodb_service.app.models.db_schemas import Complaint
-import bcrypt
+from backend.mongodb_service.app.mongodb.complaint_repository import (
+    update_complaint_fields,
+    list_employee_tasks,
+    complaint_events,
+    list_versions,
+    status_filter,
+)
+from backend.mongodb_service.app.core.passwords import hash_password, verify_password
+from backend.mongodb_service.app.core.events import sse_stream
+from backend.mongodb_service.app.core.config import (
+    complaint_events_heartbeat_seconds,
+    single_flight_reuse_seconds,
+)
+from backend.mongodb_service.app.core.single_flight import SingleFlight
 
 employee_router = APIRouter()
 
@@ -16,12 +30,12 @@ class EmployeeLogin(BaseModel):
 
 @employee_router.post("/employee/login")
 async def employee_login(data: EmployeeLogin):
-    user = await employees_col.find_one({"email": data.email})
+    user = await employees_col().find_one({"email": data.email})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email")
 
     # Password validation (stored as bcrypt hash string)
-    if not bcrypt.checkpw(data.password.encode(), user["password"].encode()):
+    if not await verify_password(data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid password")
 
     return {
@@ -37,41 +51,60 @@ async def employee_login(data: EmployeeLogin):
 # ============================================================
 class EmployeeTasksRequest(BaseModel):
     email: str
+    status: str | None = None
+    limit: int | None = Field(default=None, ge=1, le=500)
+    cursor: str | None = None
 
 
 @employee_router.post("/employee/tasks")
 async def employee_tasks(data: EmployeeTasksRequest):
     """
-    Return all complaints where assigned_to == employee email.
+    Return complaints where assigned_to == employee email, newest first.
     Used by the Streamlit 'My Tasks' page.
+    Optional: status filter, limit + cursor paging (X-Next-Cursor header).
     """
-    docs = await Complaint.find_all().to_list()
-
-    tasks = []
-    for doc in docs:
-        for cid, comp in doc.complaints.items():
-            # normalize to dict
-            if not isinstance(comp, dict):
-                comp = {
-                    "complaint_details": getattr(comp, "complaint_details", None),
-                    "status": getattr(comp, "status", "Pending"),
-                    "created_at": getattr(comp, "created_at", None),
-                    "assigned_to": getattr(comp, "assigned_to", None),
-                }
-
-            if comp.get("assigned_to") == data.email:
-                tasks.append(
-                    {
-                        "complaint_id": cid,
-                        "customer": doc.name,
-                        "mobile": doc.mobile_number,
-                        "issue": comp.get("complaint_details"),
-                        "status": comp.get("status", "Pending"),
-                        "created_at": comp.get("created_at"),
-                    }
-                )
-
-    return tasks
+    rows, next_cursor = await list_employee_tasks(
+        data.email,
+        status=status_filter(data.status),
+        limit=data.limit,
+        cursor=data.cursor,
+    )
+
+    tasks = [
+        {
+            "complaint_id": row["complaint_id"],
+            "customer": row["name"],
+            "mobile": row["mobile"],
+            "issue": row.get("issue"),
+            "status": row["status"],
+            "created_at": row.get("created_at"),
+        }
+        for row in rows
+    ]
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(tasks, headers=headers)
+
+
+# ============================================================
+# 2b) EMPLOYEE – LIVE TASK CHANGES (Server-Sent Events)
+# ============================================================
+@employee_router.get("/employee/tasks/events")
+async def employee_task_events(email: str):
+    """
+    Streams complaint changes that concern this employee: assigned to
+    them, status changed while assigned to them, or taken away from them
+    (assigned_to moved, previous_assigned_to is them). Fetch /employee/tasks
+    once, then apply these; on a "resync" event fetch again.
+    """
+    subscription = complaint_events.subscribe(
+        lambda event: email in (event["assigned_to"], event["previous_assigned_to"])
+    )
+    return StreamingResponse(
+        sse_stream(subscription, complaint_events_heartbeat_seconds, orjson.dumps),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ============================================================
@@ -88,29 +121,11 @@ async def employee_update(payload: EmployeeUpdate):
     Employee changes the status of an assigned complaint.
     This updates the same Complaint document used by admin + customer.
     """
-    docs = await Complaint.find_all().to_list()
-
-    for doc in docs:
-        if payload.complaint_id in doc.complaints:
-            comp = doc.complaints[payload.complaint_id]
+    found = await update_complaint_fields(payload.complaint_id, status=payload.status)
+    if not found:
+        raise HTTPException(status_code=404, detail="Complaint not found")
 
-            # normalize to dict
-            if not isinstance(comp, dict):
-                comp = {
-                    "complaint_details": getattr(comp, "complaint_details", None),
-                    "status": getattr(comp, "status", "Pending"),
-                    "created_at": getattr(comp, "created_at", None),
-                    "assigned_to": getattr(comp, "assigned_to", None),
-                }
-
-            comp["status"] = payload.status
-
-            doc.complaints[payload.complaint_id] = comp
-            await doc.save()
-
-            return {"status": "ok"}
-
-    raise HTTPException(status_code=404, detail="Complaint not found")
+    return {"status": "ok"}
 
 
 # ============================================================
@@ -128,11 +143,11 @@ async def create_employee(data: EmployeeCreate):
     Create employee with bcrypt-hashed password.
     Can be called from Swagger.
     """
-    exists = await employees_col.find_one({"email": data.email})
+    exists = await employees_col().find_one({"email": data.email})
     if exists:
         raise HTTPException(status_code=400, detail="Employee already exists")
 
-    hashed_pw = bcrypt.hashpw(data.password.encode(), bcrypt.gensalt()).decode()
+    hashed_pw = await hash_password(data.password)
 
     new_emp = {
         "name": data.name,
@@ -141,7 +156,8 @@ async def create_employee(data: EmployeeCreate):
         "assigned_tasks": [],
     }
 
-    await employees_col.insert_one(new_emp)
+    await employees_col().insert_one(new_emp)
+    list_versions.bump("employees")
 
     return {"message": "Employee Created", "email": data.email}
 
@@ -149,18 +165,29 @@ async def create_employee(data: EmployeeCreate):
 # ============================================================
 # 5) LIST ALL EMPLOYEES – for admin dropdown
 # ============================================================
+# Every admin page load asks for this; concurrent ones share one query
+employees_list_flight = SingleFlight("employees_list", reuse_seconds=single_flight_reuse_seconds)
+
+
 @employee_router.get("/employees/list")
-async def list_employees():
-    employees = await employees_col.find({}).to_list(None)
+async def list_employees(request: Request):
+    # Only changes when an employee is created here; unchanged -> 304
+    etag = list_versions.etag("employees")
+    if list_versions.matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    async def load():
+        employees = await employees_col().find({}, {"name": 1, "email": 1}).to_list(None)
 
-    result = []
-    for emp in employees:
-        result.append(
+        result = [
             {
                 "id": str(emp["_id"]),
                 "name": emp.get("name"),
                 "email": emp.get("email"),
             }
-        )
+            for emp in employees
+        ]
+        return orjson.dumps(result)
 
-    return result
+    body = await employees_list_flight.run(list_versions.version("employees"), load)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
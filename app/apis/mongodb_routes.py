@@ -1,40 +1,51 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from datetime import datetime, timedelta, timezone
+import asyncio
+import csv
+import io
+import tempfile
+import orjson
 
 from backend.mongodb_service.app.models.data_models import (
     RegisterComplaint,
     ComplaintStatus,
+    ComplaintStatusBatch,
 )
-from backend.mongodb_service.app.mongodb.db_connections import (
-    insert_in_db,
-    check_user_exists,
-    add_complaint_to_user,
+from backend.mongodb_service.app.mongodb.complaint_repository import (
+    register_complaint,
     get_complaint_status,
+    get_complaint_statuses,
+    update_complaint_fields,
+    list_complaints_page,
+    iter_complaint_rows,
+    list_customer_complaints,
+    complaint_cache,
+    complaint_events,
+    list_versions,
+    status_filter,
+    parse_status,
 )
-from backend.mongodb_service.app.models.db_schemas import Complaint
+from backend.mongodb_service.app.mongodb.bulk_ingest import iter_records, ingest_records
+from backend.mongodb_service.app.mongodb.dashboard_counters import dashboard_summary
+from backend.mongodb_service.app.mongodb.analytics import complaint_trends, resolution_times
+from backend.mongodb_service.app.models.db_schemas import map_status
+from backend.mongodb_service.app.core.config import (
+    bulk_ingest_batch_size,
+    complaint_events_heartbeat_seconds,
+    single_flight_reuse_seconds,
+)
+from backend.mongodb_service.app.core.slow_queries import slow_query_recorder
+from backend.mongodb_service.app.core.events import sse_stream
+from backend.mongodb_service.app.core.single_flight import SingleFlight
 
-from pydantic import BaseModel
-from typing import List, Any, Dict
+from pydantic import BaseModel, Field
 
 mongo_router = APIRouter()
 
-# -----------------------------------------------------------
-# Status Mapper
-# -----------------------------------------------------------
-STATUS_MAP = {
-    "open": "Pending",
-    "pending": "Pending",
-    "in progress": "In Progress",
-    "inprogress": "In Progress",
-    "resolved": "Resolved",
-    "closed": "Closed",
-}
-
-def map_status(input_status: str | None):
-    if not input_status:
-        return "Pending"
-    return STATUS_MAP.get(input_status.lower(), "Pending")
 
+def priority_label(status_val: str):
+    return "High" if status_val in ["Pending", "In Progress"] else "Normal"
 
 # -----------------------------------------------------------
 # Register or Add Complaint
@@ -44,15 +55,32 @@ async def create_complaint(data: RegisterComplaint):
     if not data.mobile_number:
         raise HTTPException(status_code=400, detail="Missing mobile_number")
 
-    # Check if user exists
-    obj_id = await check_user_exists(data.mobile_number)
+    return await register_complaint(data)
 
-    # New user → insert fresh document
-    if not obj_id:
-        return await insert_in_db(data)
 
-    # Existing user → add complaint
-    return await add_complaint_to_user(mongo_id=obj_id, new_complaint=data)
+# -----------------------------------------------------------
+# Bulk register complaints (NDJSON / CSV body)
+# -----------------------------------------------------------
+@mongo_router.post("/register-complaints-bulk/")
+async def bulk_register_complaints(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(bulk_ingest_batch_size, ge=1, le=10000),
+):
+    """
+    Body is the raw file. It is spooled (to disk past 16 MB) and parsed
+    row by row, so CSV fields with embedded newlines work too.
+    Returns counts plus a per-row complaint_id or error.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        # utf-8-sig: Excel's "CSV UTF-8" starts with a BOM that would
+        # otherwise stick to the first header name
+        text_file = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        return await ingest_records(iter_records(text_file, format), batch_size)
 
 
 # -----------------------------------------------------------
@@ -63,16 +91,27 @@ async def check_complaint_status(data: ComplaintStatus):
     if not data.mobile_number:
         raise HTTPException(status_code=400, detail="Missing mobile_number")
 
-    obj_id = await check_user_exists(data.mobile_number)
-    if not obj_id:
-        raise HTTPException(status_code=404, detail="User not found")
-
     return await get_complaint_status(
-        obj_id=obj_id,
+        mobile_number=data.mobile_number,
         complaint_id=data.complaint_id
     )
 
 
+# -----------------------------------------------------------
+# Check status of many complaints in one call
+# -----------------------------------------------------------
+@mongo_router.post("/check-complaint-status-batch/")
+async def check_complaint_status_batch(data: ComplaintStatusBatch):
+    """
+    Per-item results in request order. Unknown pairs come back with an
+    "error" field instead of failing the whole batch.
+    """
+    results = await get_complaint_statuses(
+        [(item.mobile_number, item.complaint_id) for item in data.items]
+    )
+    return ORJSONResponse(results)
+
+
 # -----------------------------------------------------------
 # User – List My Complaints
 # -----------------------------------------------------------
@@ -81,79 +120,242 @@ class UserComplaintsRequest(BaseModel):
 
 
 @mongo_router.post("/user/complaints")
-async def list_user_complaints(req: UserComplaintsRequest) -> List[Dict[str, Any]]:
+async def list_user_complaints(req: UserComplaintsRequest, request: Request):
     if not req.mobile:
         raise HTTPException(status_code=400, detail="Missing mobile")
 
-    complaint_doc = await Complaint.find_one({"mobile_number": req.mobile})
-    if not complaint_doc:
-        return []
+    # Polling clients send back the ETag; unchanged -> 304 without a query
+    etag = list_versions.etag(("customer", req.mobile))
+    if list_versions.matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # The rows may be newer than the tag checked above; send the tag they were read under
+    version, rows = await list_customer_complaints(req.mobile)
+
+    # Rows are raw dicts already in response shape – serialize them
+    # straight with orjson instead of FastAPI's validate + jsonable_encoder.
+    return ORJSONResponse([
+        {
+            "complaint_id": row["complaint_id"],
+            "name": row["name"],
+            "mobile": row["mobile"],
+            "issue": row.get("issue"),
+            "status": map_status(row.get("status")),
+            "created_at": row.get("created_at"),
+        }
+        for row in rows
+    ], headers={"ETag": list_versions.tag(version)})
 
-    results = []
 
-    for complaint_id, comp in complaint_doc.complaints.items():
+# -----------------------------------------------------------
+# Admin – List All Complaints (AI-ready)
+# -----------------------------------------------------------
+# Dashboards opening together send the same page many times at once;
+# they share one query and one encoded body.
+admin_list_flight = SingleFlight("admin_complaints", reuse_seconds=single_flight_reuse_seconds)
 
-        # Normalize document → dict
-        if isinstance(comp, dict):
-            details = comp
-        else:
-            details = {
-                "complaint_details": getattr(comp, "complaint_details", None),
-                "status": map_status(getattr(comp, "status", None)),
-                "created_at": getattr(comp, "created_at", None),
-            }
 
-        results.append({
-            "complaint_id": complaint_id,
-            "name": complaint_doc.name,
-            "mobile": complaint_doc.mobile_number,
-            "issue": details.get("complaint_details"),
-            "status": map_status(details.get("status")),
-            "created_at": details.get("created_at"),
-        })
+@mongo_router.get("/admin/complaints")
+async def admin_list_complaints(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    status: str | None = None,
+    assigned_to: str | None = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """
+    One page of complaints, newest first by default.
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    Answers If-None-Match with 304 while no complaint has changed.
+    """
+    etag = list_versions.etag("complaints")
+    if list_versions.matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    status = status_filter(status)
+
+    async def load():
+        rows, next_cursor = await list_complaints_page(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            assigned_to=assigned_to,
+            descending=order == "desc",
+        )
+        for row in rows:
+            row["priority_label"] = priority_label(row["status"])
+        return orjson.dumps(rows), next_cursor
+
+    # The version is part of the key, so nothing written since the ETag
+    # was taken is ever answered from an older result
+    key = (limit, cursor, status, assigned_to, order, list_versions.version("complaints"))
+    body, next_cursor = await admin_list_flight.run(key, load)
+
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(body, media_type="application/json", headers=headers)
 
-    return results
+
+# -----------------------------------------------------------
+# Admin – Live complaint changes (SSE and WebSocket)
+# Fetch /admin/complaints once, then apply these events; on a
+# "resync" event (or a closed socket) fetch again.
+# -----------------------------------------------------------
+def _event_filter(assigned_to: str | None):
+    if not assigned_to:
+        return None
+    return lambda event: assigned_to in (event["assigned_to"], event["previous_assigned_to"])
+
+
+@mongo_router.get("/admin/complaints/events")
+async def admin_complaint_events(assigned_to: str | None = None):
+    subscription = complaint_events.subscribe(_event_filter(assigned_to))
+    return StreamingResponse(
+        sse_stream(subscription, complaint_events_heartbeat_seconds, orjson.dumps),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@mongo_router.websocket("/ws/complaints")
+async def complaint_events_socket(websocket: WebSocket, assigned_to: str | None = None):
+    """Same events as /admin/complaints/events, one JSON text frame each."""
+    await websocket.accept()
+    subscription = complaint_events.subscribe(_event_filter(assigned_to))
+    try:
+        while True:
+            event = await subscription.next(complaint_events_heartbeat_seconds)
+            if event is None:
+                await websocket.send_text('{"type": "resync"}')
+                await websocket.close()
+                return
+            if event == "heartbeat":
+                await websocket.send_text('{"type": "heartbeat"}')
+                continue
+            await websocket.send_text(orjson.dumps(event).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
 
 
 # -----------------------------------------------------------
-# Admin – List All Complaints (AI-ready)
+# Admin – Dashboard totals (status counts, per-employee workload)
 # -----------------------------------------------------------
-@mongo_router.get("/admin/complaints")
-async def admin_list_complaints() -> List[Dict[str, Any]]:
-    docs = await Complaint.find_all().to_list()
-    rows = []
-
-    for doc in docs:
-        for complaint_id, comp in doc.complaints.items():
-
-            if isinstance(comp, dict):
-                details = comp
-            else:
-                details = {
-                    "complaint_details": getattr(comp, "complaint_details", None),
-                    "status": map_status(getattr(comp, "status", None)),
-                    "created_at": getattr(comp, "created_at", None),
-                }
-
-            status_val = map_status(details.get("status"))
-
-            priority_label = "High" if status_val in ["Pending", "In Progress"] else "Normal"
-
-            rows.append({
-                "complaint_id": complaint_id,
-                "name": doc.name,
-                "mobile": doc.mobile_number,
-                "issue": details.get("complaint_details"),
-                "status": status_val,
-                "created_at": details.get("created_at"),
-                "priority_label": priority_label,
-            })
-
-    rows.sort(
-        key=lambda r: (r.get("created_at") is None, r.get("created_at")),
-        reverse=True
+@mongo_router.get("/admin/complaints/summary")
+async def admin_complaints_summary():
+    """
+    Reads the counter documents kept by the write paths – a few dozen
+    small documents however many complaints there are.
+    """
+    return await dashboard_summary()
+
+
+# -----------------------------------------------------------
+# Admin – Analytics (precomputed rollups, times in UTC)
+# -----------------------------------------------------------
+def _naive_utc(value: datetime | None):
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _analytics_range(start: datetime | None, end: datetime | None, default_days: int):
+    start, end = _naive_utc(start), _naive_utc(end)
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=default_days)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return start, end
+
+
+@mongo_router.get("/admin/analytics/trends")
+async def admin_analytics_trends(
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+):
+    """Complaints created / resolved per hour or day; defaults to the last 30 days."""
+    start, end = _analytics_range(start, end, default_days=30)
+    return await complaint_trends(granularity, start, end)
+
+
+@mongo_router.get("/admin/analytics/resolution-times")
+async def admin_analytics_resolution_times(start: datetime | None = None, end: datetime | None = None):
+    """Resolved count and median time-to-resolve per employee; defaults to the last 30 days."""
+    start, end = _analytics_range(start, end, default_days=30)
+    return await resolution_times(start, end)
+
+
+# -----------------------------------------------------------
+# Admin – Export All Complaints (NDJSON / CSV stream)
+# -----------------------------------------------------------
+EXPORT_COLUMNS = [
+    "complaint_id",
+    "name",
+    "mobile",
+    "issue",
+    "status",
+    "assigned_to",
+    "created_at",
+    "priority_label",
+]
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _export_ndjson(rows):
+    async for row in rows:
+        row["priority_label"] = priority_label(row["status"])
+        yield orjson.dumps(row) + b"\n"
+
+
+async def _export_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        row["priority_label"] = priority_label(row["status"])
+        writer.writerow({k: _export_value(row.get(k)) for k in EXPORT_COLUMNS})
+        yield buffer.getvalue()
+
+
+@mongo_router.get("/admin/complaints/export")
+async def admin_export_complaints(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: str | None = None,
+    assigned_to: str | None = None,
+    batch_size: int = Query(500, ge=1, le=10000),
+):
+    """
+    Streams every complaint row as it comes off the cursor, so memory
+    stays flat whatever the collection size.
+    """
+    rows = iter_complaint_rows(
+        status=status_filter(status),
+        assigned_to=assigned_to,
+        batch_size=batch_size,
     )
-    return rows
+
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=complaints.csv"},
+        )
+
+    return StreamingResponse(_export_ndjson(rows), media_type="application/x-ndjson")
 
 
 # -----------------------------------------------------------
@@ -171,32 +373,73 @@ async def admin_update_complaint(payload: AdminUpdateComplaint):
     if not payload.complaint_id:
         raise HTTPException(status_code=400, detail="complaint_id is required")
 
-    docs = await Complaint.find_all().to_list()
+    found = await update_complaint_fields(
+        payload.complaint_id,
+        status=payload.status or None,
+        assigned_to=payload.assigned_to or None,
+    )
+    if not found:
+        raise HTTPException(status_code=404, detail="Complaint not found")
 
-    for doc in docs:
-        if payload.complaint_id in doc.complaints:
+    return {"status": "ok", "complaint_id": payload.complaint_id}
 
-            comp = doc.complaints[payload.complaint_id]
 
-            if not isinstance(comp, dict):
-                comp = {
-                    "complaint_details": getattr(comp, "complaint_details", None),
-                    "status": map_status(getattr(comp, "status", None)),
-                    "created_at": getattr(comp, "created_at", None),
-                }
+# -----------------------------------------------------------
+# Admin – Bulk triage: many updates in one request
+# -----------------------------------------------------------
+class AdminUpdateBatch(BaseModel):
+    items: list[AdminUpdateComplaint] = Field(..., min_length=1, max_length=500)
+
+
+@mongo_router.post("/admin/complaints/update-batch")
+async def admin_update_complaints_batch(payload: AdminUpdateBatch):
+    """
+    Queues every update at once – they are merged per complaint and go
+    out together. Per item: "ok", "not_found" or "error". An
+    unknown status anywhere rejects the whole batch with 400 before
+    anything is queued.
+    """
+    for item in payload.items:
+        if item.status:
+            parse_status(item.status)
+
+    outcomes = await asyncio.gather(
+        *(
+            update_complaint_fields(
+                item.complaint_id,
+                status=item.status or None,
+                assigned_to=item.assigned_to or None,
+            )
+            for item in payload.items
+        ),
+        return_exceptions=True,
+    )
 
-            # Update status
-            if payload.status:
-                comp["status"] = map_status(payload.status)
+    results = []
+    for item, outcome in zip(payload.items, outcomes):
+        if isinstance(outcome, BaseException):
+            detail = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+            results.append({"complaint_id": item.complaint_id, "status": "error", "detail": detail})
+        else:
+            results.append({"complaint_id": item.complaint_id, "status": "ok" if outcome else "not_found"})
+
+    return ORJSONResponse(results)
 
-            # Update assignee
-            if payload.assigned_to:
-                comp["assigned_to"] = payload.assigned_to
 
-            # Save back
-            doc.complaints[payload.complaint_id] = comp
-            await doc.save()
+# -----------------------------------------------------------
+# Admin – Read cache counters
+# -----------------------------------------------------------
+@mongo_router.get("/admin/cache/stats")
+async def admin_cache_stats():
+    return complaint_cache.stats()
 
-            return {"status": "ok", "complaint_id": payload.complaint_id}
 
-    raise HTTPException(status_code=404, detail="Complaint not found")
+# -----------------------------------------------------------
+# Admin – Slow MongoDB operations (newest first)
+# -----------------------------------------------------------
+@mongo_router.get("/admin/slow-queries")
+async def admin_slow_queries(limit: int = Query(100, ge=1, le=1000)):
+    return {
+        "threshold_ms": slow_query_recorder.threshold_ms,
+        "records": slow_query_recorder.recent(limit),
+    }
@@ -1,20 +1,18 @@
 from fastapi import APIRouter, HTTPException
 from backend.mongodb_service.app.models.users_model import UserCreate, UserLogin, UserInDB
-from backend.mongodb_service.app.mongodb.db_connections import db
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from backend.mongodb_service.app.mongodb.db_connections import get_db
+from backend.mongodb_service.app.core.passwords import hash_password, verify_password
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("/register")
 async def register_user(user: UserCreate):
     # Check if user exists
-    existing = await db.users.find_one({"email": user.email})
+    existing = await get_db().users.find_one({"email": user.email})
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
 
-    hashed_pw = pwd_context.hash(user.password)
+    hashed_pw = await hash_password(user.password)
 
     user_dict = {
         "name": user.name,
@@ -23,17 +21,17 @@ async def register_user(user: UserCreate):
         "role": "user"
     }
 
-    result = await db.users.insert_one(user_dict)
+    result = await get_db().users.insert_one(user_dict)
     return {"msg": "User created", "id": str(result.inserted_id)}
 
 
 @router.post("/login")
 async def login_user(data: UserLogin):
-    user = await db.users.find_one({"email": data.email})
+    user = await get_db().users.find_one({"email": data.email})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not pwd_context.verify(data.password, user["password"]):
+    if not await verify_password(data.password, user["password"]):
         raise HTTPException(status_code=400, detail="Incorrect password")
 
     return {
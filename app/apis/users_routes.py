@@ -1,11 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from backend.mongodb_service.app.models.users_model import User, RegisterUser, LoginUser
-from passlib.context import CryptContext
+from backend.mongodb_service.app.core.passwords import hash_password, verify_password
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # -----------------------------
 # REGISTER USER
 # -----------------------------
@@ -16,7 +14,7 @@ async def register_user(data: RegisterUser):
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pw = pwd_context.hash(data.password)
+    hashed_pw = await hash_password(data.password)
 
     user = User(
         name=data.name,
@@ -41,7 +39,7 @@ async def login_user(data: LoginUser):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not pwd_context.verify(data.password, user.password):
+    if not await verify_password(data.password, user.password):
         raise HTTPException(status_code=400, detail="Incorrect password")
 
     return {
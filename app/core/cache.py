@@ -0,0 +1,69 @@
+from cachetools import TTLCache
+
+# -------------------------------------------------------
+# Small in-process read-through cache: LRU eviction once
+# maxsize is reached, every entry expires after ttl seconds.
+# Writers must call invalidate() for the keys they touch.
+# -------------------------------------------------------
+MISSING = object()
+
+
+class ReadCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.enabled = ttl > 0 and maxsize > 0
+        self._entries = TTLCache(maxsize=max(maxsize, 1), ttl=max(ttl, 0.001))
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        if not self.enabled:
+            return MISSING
+
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.enabled:
+            self._entries[key] = value
+
+    def invalidate(self, *keys):
+        for key in keys:
+            if self._entries.pop(key, MISSING) is not MISSING:
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "ttl_seconds": self._entries.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+    def metric_lines(self):
+        """Prometheus exposition lines for /metrics."""
+        label = f'cache="{self.name}"'
+        return [
+            "# TYPE read_cache_hits_total counter",
+            f"read_cache_hits_total{{{label}}} {self.hits}",
+            "# TYPE read_cache_misses_total counter",
+            f"read_cache_misses_total{{{label}}} {self.misses}",
+            "# TYPE read_cache_invalidations_total counter",
+            f"read_cache_invalidations_total{{{label}}} {self.invalidations}",
+            "# TYPE read_cache_entries gauge",
+            f"read_cache_entries{{{label}}} {len(self._entries)}",
+        ]
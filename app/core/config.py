@@ -19,12 +19,86 @@ mongodb_database = os.getenv("MONGODB_DATABASE_NAME_TEST", "helpdesk_db")
 
 mongodb_uri = f"mongodb://{mongodb_host}:{mongodb_port}"
 
+# Index builds, the lookup-field backfill and the index report on startup.
+# Set to 0 on extra replicas so they become ready without them.
+db_startup_maintenance = os.getenv("DB_STARTUP_MAINTENANCE", "1") == "1"
+
 # ----------------------------
 # Services
 # ----------------------------
 url_mongodb_service = os.getenv("MONGODB_SERVICE")
 url_chat_service = os.getenv("CHAT_SERVICE")
 
-print("💾 Mongo URI =", mongodb_uri)
-print("💾 Mongo DB =", mongodb_database)
-print("🌐 MongoDB SERVICE =", url_mongodb_service)
+# HTTP client used to call the services above (apis_clients.Api / AsyncApi)
+api_client_timeout = float(os.getenv("API_CLIENT_TIMEOUT", "5"))
+api_client_retries = int(os.getenv("API_CLIENT_RETRIES", "2"))
+api_client_max_connections = int(os.getenv("API_CLIENT_MAX_CONNECTIONS", "20"))
+
+# ----------------------------
+# Password hashing pool
+# ----------------------------
+password_hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+password_hash_max_queue = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# ----------------------------
+# Complaint storage
+# ----------------------------
+# While the nested -> per-complaint migration is in progress, reads also
+# look at customers not migrated yet. Set to 0 once migrate_complaints
+# reports nothing left.
+complaint_legacy_reads = os.getenv("COMPLAINT_LEGACY_READS", "1") == "1"
+
+# ----------------------------
+# Complaint read cache
+# ----------------------------
+# Entries live at most this long, which bounds how stale a cached status
+# can be even if an invalidation races a read. 0 disables the cache.
+complaint_cache_ttl_seconds = float(os.getenv("COMPLAINT_CACHE_TTL_SECONDS", "5"))
+complaint_cache_max_entries = int(os.getenv("COMPLAINT_CACHE_MAX_ENTRIES", "10000"))
+
+# ----------------------------
+# Bulk complaint ingestion
+# ----------------------------
+bulk_ingest_batch_size = int(os.getenv("BULK_INGEST_BATCH_SIZE", "1000"))
+
+# ----------------------------
+# Slow-query log
+# ----------------------------
+slow_query_threshold_ms = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+slow_query_explain = os.getenv("SLOW_QUERY_EXPLAIN", "0") == "1"
+slow_query_explain_interval_seconds = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))   # per shape
+slow_query_max_records = int(os.getenv("SLOW_QUERY_MAX_RECORDS", "500"))
+slow_query_log_path = os.getenv("SLOW_QUERY_LOG_PATH", "slow_queries.log")   # "" disables the file
+slow_query_log_max_bytes = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+slow_query_log_backups = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+
+# ----------------------------
+# Live complaint events (SSE / WebSocket)
+# ----------------------------
+complaint_events_queue_size = int(os.getenv("COMPLAINT_EVENTS_QUEUE_SIZE", "256"))
+complaint_events_heartbeat_seconds = float(os.getenv("COMPLAINT_EVENTS_HEARTBEAT_SECONDS", "15"))
+# 1 = publish from a MongoDB change stream on complaint_items (replica set
+# only) instead of from this process's own writes – needed as soon as
+# more than one worker/replica serves writes.
+complaint_events_change_stream = os.getenv("COMPLAINT_EVENTS_CHANGE_STREAM", "0") == "1"
+
+# ----------------------------
+# ETags of the polled list endpoints
+# ----------------------------
+# Per-customer versions remembered; older ones fall back to the global one
+list_version_max_keys = int(os.getenv("LIST_VERSION_MAX_KEYS", "100000"))
+
+# ----------------------------
+# Read coalescing (single-flight) for the admin list endpoints
+# ----------------------------
+# Identical concurrent requests always share one query; a finished result
+# is also reused for this long (0 = only share while in flight).
+single_flight_reuse_seconds = float(os.getenv("SINGLE_FLIGHT_REUSE_SECONDS", "1"))
+
+# ----------------------------
+# Write queue for status / assignee updates
+# ----------------------------
+# A batch is flushed (one read, concurrent writes) once this many complaints are
+# pending, or this many milliseconds after the first one.
+write_queue_max_batch = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "500"))
+write_queue_max_delay_ms = float(os.getenv("WRITE_QUEUE_MAX_DELAY_MS", "20"))
@@ -0,0 +1,105 @@
+import asyncio
+
+# -------------------------------------------------------
+# In-process event bus for live complaint updates.
+#
+# Each SSE / WebSocket connection subscribes with a bounded
+# queue and an optional filter. publish() never waits: a
+# subscriber whose queue is full is dropped and gets None,
+# which tells the endpoint to ask its client to refetch.
+#
+# Only sees writes made by this process – with several
+# workers/replicas enable COMPLAINT_EVENTS_CHANGE_STREAM so
+# events come from MongoDB instead.
+# -------------------------------------------------------
+
+
+class Subscription:
+    def __init__(self, bus, queue_size: int, accepts):
+        self.bus = bus
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.accepts = accepts
+
+    async def next(self, timeout: float):
+        """Next event; "heartbeat" after timeout idle seconds; None once dropped."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return "heartbeat"
+
+    def close(self):
+        self.bus.subscribers.discard(self)
+
+
+class EventBus:
+    def __init__(self, name: str, queue_size: int):
+        self.name = name
+        self.queue_size = queue_size
+        self.subscribers: set[Subscription] = set()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, accepts=None) -> Subscription:
+        """accepts: optional predicate on the event dict."""
+        subscription = Subscription(self, self.queue_size, accepts)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def publish(self, event: dict):
+        self.published += 1
+        for subscription in list(self.subscribers):
+            if subscription.accepts and not subscription.accepts(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def resync(self):
+        """Drop every subscriber with the end marker – their clients refetch."""
+        for subscription in list(self.subscribers):
+            self._drop(subscription)
+
+    def _drop(self, subscription: Subscription):
+        subscription.close()
+        self.dropped += 1
+        if subscription.queue.full():
+            # Make room for the end-of-stream marker; the client
+            # refetches anyway
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def metric_lines(self):
+        label = f'bus="{self.name}"'
+        return [
+            "# TYPE event_bus_subscribers gauge",
+            f"event_bus_subscribers{{{label}}} {len(self.subscribers)}",
+            "# TYPE event_bus_published_total counter",
+            f"event_bus_published_total{{{label}}} {self.published}",
+            "# TYPE event_bus_dropped_subscribers_total counter",
+            f"event_bus_dropped_subscribers_total{{{label}}} {self.dropped}",
+        ]
+
+
+# -----------------------------------
+# Server-Sent Events framing
+# -----------------------------------
+async def sse_stream(subscription: Subscription, heartbeat_seconds: float, encode):
+    """
+    Yields an SSE body for the subscription: one "data:" frame per event,
+    a comment line when idle (keeps proxies from timing out) and a final
+    "resync" event if the subscriber fell behind and was dropped.
+    """
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            event = await subscription.next(heartbeat_seconds)
+            if event is None:
+                yield b"event: resync\ndata: {}\n\n"
+                return
+            if event == "heartbeat":
+                yield b": keep-alive\n\n"
+                continue
+            yield b"event: " + event["type"].encode() + b"\ndata: " + encode(event) + b"\n\n"
+    finally:
+        subscription.close()
@@ -0,0 +1,231 @@
+import bisect
+import contextvars
+import threading
+import time
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+# -------------------------------------------------------
+# Request / MongoDB metrics, rendered in Prometheus text
+# format by GET /metrics.
+#
+# MetricsMiddleware opens a RequestStats for every HTTP request
+# and parks it in a contextvar; CommandMetrics (a pymongo
+# CommandListener on the Motor client) adds each command's count
+# and duration to whatever request issued it.
+# -------------------------------------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_COMMAND_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RequestStats:
+    __slots__ = ("method", "route", "db_commands", "db_seconds")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.db_commands = 0
+        self.db_seconds = 0.0
+
+
+current_request: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+# (method, route, status) -> count
+_requests_total = {}
+# (method, route) -> Histogram / gauge / sums
+_request_latency = {}
+_request_db_commands = {}
+_request_db_seconds = {}
+_in_flight = {}
+# command name -> [count, failures, seconds]
+_mongo_commands = {}
+
+# name -> callable returning extra exposition lines (e.g. cache counters)
+_collectors = {}
+
+
+def register_collector(name: str, collector):
+    _collectors[name] = collector
+
+
+def _escape(value: str):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# -----------------------------------
+# MongoDB command listener
+# -----------------------------------
+class CommandMetrics(monitoring.CommandListener):
+    """
+    pymongo calls these from Motor's worker threads. Motor runs each
+    operation in a copy of the caller's context, so current_request still
+    points at the request that issued the command.
+    """
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, failed: bool):
+        seconds = event.duration_micros / 1_000_000
+
+        with _lock:
+            entry = _mongo_commands.setdefault(event.command_name, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += failed
+            entry[2] += seconds
+
+            stats = current_request.get()
+            if stats is not None:
+                stats.db_commands += 1
+                stats.db_seconds += seconds
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+command_metrics = CommandMetrics()
+
+
+# -----------------------------------
+# HTTP middleware
+# -----------------------------------
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware so the route template (not the raw path) is
+    known before the handler runs – keeps label cardinality bounded.
+    Adds a Server-Timing header with the request's DB time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _route_of(self, scope):
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", scope["path"])
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        route = self._route_of(scope)
+        key = (method, route)
+        stats = RequestStats(method, route)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_commands} commands"'
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        with _lock:
+            _in_flight[key] = _in_flight.get(key, 0) + 1
+        started = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+
+            with _lock:
+                _in_flight[key] -= 1
+                status_key = (method, route, status_code)
+                _requests_total[status_key] = _requests_total.get(status_key, 0) + 1
+                _request_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+                _request_db_commands.setdefault(key, Histogram(DB_COMMAND_BUCKETS)).observe(stats.db_commands)
+                _request_db_seconds[key] = _request_db_seconds.get(key, 0.0) + stats.db_seconds
+
+
+# -----------------------------------
+# Prometheus exposition
+# -----------------------------------
+def render_metrics() -> str:
+    lines = []
+
+    def labels(method, route):
+        return f'method="{method}",route="{_escape(route)}"'
+
+    with _lock:
+        lines.append("# HELP http_requests_total Requests served, by route and status.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(_requests_total.items()):
+            lines.append(f'http_requests_total{{{labels(method, route)},status="{status}"}} {count}')
+
+        lines.append("# HELP http_requests_in_flight Requests currently being handled.")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        for (method, route), value in sorted(_in_flight.items()):
+            lines.append(f"http_requests_in_flight{{{labels(method, route)}}} {value}")
+
+        lines.append("# HELP http_request_duration_seconds Request latency.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route), hist in sorted(_request_latency.items()):
+            lines += hist.render("http_request_duration_seconds", labels(method, route))
+
+        lines.append("# HELP http_request_db_commands MongoDB commands issued per request.")
+        lines.append("# TYPE http_request_db_commands histogram")
+        for (method, route), hist in sorted(_request_db_commands.items()):
+            lines += hist.render("http_request_db_commands", labels(method, route))
+
+        lines.append("# HELP http_request_db_seconds_total Time spent in MongoDB commands, by route.")
+        lines.append("# TYPE http_request_db_seconds_total counter")
+        for (method, route), seconds in sorted(_request_db_seconds.items()):
+            lines.append(f"http_request_db_seconds_total{{{labels(method, route)}}} {seconds}")
+
+        # Each family's samples sit together right after its own TYPE line
+        commands = sorted(_mongo_commands.items())
+        families = [
+            ("mongodb_commands_total", "MongoDB commands, by command name.", 0),
+            ("mongodb_command_failures_total", "Failed MongoDB commands.", 1),
+            ("mongodb_command_seconds_total", "Time spent in MongoDB commands.", 2),
+        ]
+        for family, help_text, field in families:
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} counter")
+            for command, values in commands:
+                lines.append(f'{family}{{command="{command}"}} {values[field]}')
+
+    for collector in _collectors.values():
+        lines += collector()
+
+    return "\n".join(lines) + "\n"
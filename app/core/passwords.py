@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+from fastapi import HTTPException
+
+from backend.mongodb_service.app.core.config import (
+    password_hash_workers,
+    password_hash_max_queue,
+)
+
+# -------------------------------------------------------
+# bcrypt is deliberately slow (100-300 ms per call). Running it inside an
+# async route blocks the whole event loop, so every hash/verify goes to a
+# bounded process pool instead.
+# -------------------------------------------------------
+_executor: ProcessPoolExecutor | None = None
+_pending = 0
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt()).decode()
+
+
+def _verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode()[:72], hashed.encode())
+    except ValueError:
+        # Stored value is not a bcrypt hash
+        return False
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=password_hash_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending >= password_hash_max_queue:
+        raise HTTPException(status_code=503, detail="Too many login requests, please retry")
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+
+
+# -----------------------------------
+# Public API
+# -----------------------------------
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_verify, password, hashed)
+
+
+def pending_operations() -> int:
+    return _pending
+
+
+def shutdown_password_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
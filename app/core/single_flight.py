@@ -0,0 +1,77 @@
+import asyncio
+
+from cachetools import TTLCache
+
+from backend.mongodb_service.app.core.metrics import register_collector
+
+# -------------------------------------------------------
+# Single-flight: concurrent calls with the same key share
+# one execution and its result. Optionally the result is
+# reused for reuse_seconds after it completes.
+#
+# The shared work runs in its own task, so a caller that
+# disconnects (and is cancelled) does not cancel it for the
+# others. Results are shared objects – callers must not
+# mutate them; hand out encoded bytes or tuples.
+#
+# Put whatever makes a result stale into the key (e.g. the
+# list version behind the ETag) so a write never gets
+# answered from an older result.
+#
+# Every group reports under /metrics through one collector,
+# labelled group="<name>".
+# -------------------------------------------------------
+_groups = []
+
+
+class SingleFlight:
+    def __init__(self, name: str, reuse_seconds: float = 0.0, max_reused: int = 1000):
+        self.name = name
+        self._inflight: dict = {}
+        self._recent = TTLCache(maxsize=max_reused, ttl=reuse_seconds) if reuse_seconds > 0 else None
+        self.executions = 0
+        self.collapsed = 0
+        self.reused = 0
+        _groups.append(self)
+
+    async def run(self, key, fn):
+        """Result of fn() for key, shared with concurrent / recent callers."""
+        if self._recent is not None and key in self._recent:
+            self.reused += 1
+            return self._recent[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.collapsed += 1
+
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        self._inflight.pop(key, None)
+        if self._recent is not None and not task.cancelled() and task.exception() is None:
+            self._recent[key] = task.result()
+
+
+# Family -> (type, value of one group); each TYPE line once, then every group
+_FAMILIES = [
+    ("single_flight_executions_total", "counter", lambda group: group.executions),
+    ("single_flight_collapsed_total", "counter", lambda group: group.collapsed),
+    ("single_flight_reused_total", "counter", lambda group: group.reused),
+    ("single_flight_in_flight", "gauge", lambda group: len(group._inflight)),
+]
+
+
+def metric_lines():
+    lines = []
+    for family, kind, value in _FAMILIES:
+        lines.append(f"# TYPE {family} {kind}")
+        lines.extend(f'{family}{{group="{group.name}"}} {value(group)}' for group in _groups)
+    return lines
+
+
+register_collector("single_flight", metric_lines)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from cachetools import TTLCache
+from pymongo import monitoring
+
+from backend.mongodb_service.app.core.config import (
+    slow_query_threshold_ms,
+    slow_query_explain,
+    slow_query_explain_interval_seconds,
+    slow_query_max_records,
+    slow_query_log_path,
+    slow_query_log_max_bytes,
+    slow_query_log_backups,
+)
+from backend.mongodb_service.app.core.metrics import current_request
+
+# -------------------------------------------------------
+# Slow-operation recorder. A pymongo CommandListener on the
+# Motor client keeps every command slower than
+# SLOW_QUERY_THRESHOLD_MS: its shape with values redacted, the
+# route that issued it and its duration. For find / aggregate it
+# can also fetch the queryPlanner explain in the background, so
+# COLLSCAN vs IXSCAN shows up next to the record
+# (SLOW_QUERY_EXPLAIN=1; off by default). Each shape is explained
+# at most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, so a slow
+# query repeated under load does not add an explain per call.
+# -------------------------------------------------------
+EXPLAINABLE = {"find", "aggregate", "count", "distinct"}
+
+# Driver-added fields that are neither part of the query nor accepted by explain
+_DRIVER_FIELDS = {"lsid", "txnNumber", "$db", "$clusterTime", "$readPreference", "autocommit", "startTransaction"}
+
+
+# Maps keyed by data (the legacy complaints.<complaint_id>): their keys
+# are values too, so they collapse to one placeholder – otherwise every
+# complaint id would be a new shape, and would end up in the log
+DYNAMIC_MAPS = {"complaints"}
+KEY_PLACEHOLDER = "<key>"
+
+
+def redact_key(key: str) -> str:
+    """'complaints.<id>.status' -> 'complaints.<key>.status'."""
+    parts = key.split(".")
+    return ".".join(
+        KEY_PLACEHOLDER if i and parts[i - 1] in DYNAMIC_MAPS else part
+        for i, part in enumerate(parts)
+    )
+
+
+def redact(value, parent: str | None = None):
+    """Keep keys and operators, replace every literal with its type name."""
+    if isinstance(value, dict):
+        if parent in DYNAMIC_MAPS and value and not any(k.startswith("$") for k in value):
+            return {KEY_PLACEHOLDER: redact(next(iter(value.values())))}
+        return {redact_key(k): redact(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        # Pipelines / update lists keep each stage; plain arrays collapse
+        if value and all(isinstance(v, dict) for v in value):
+            return [redact(v) for v in value]
+        return ["?"] if value else []
+    return f"<{type(value).__name__}>"
+
+
+def command_shape(command):
+    items = [(k, v) for k, v in command.items() if k not in _DRIVER_FIELDS]
+    if not items:
+        return {}
+    # First key is the command name; its value is the collection – keep it
+    (name, target), rest = items[0], items[1:]
+    return {name: target, **{k: redact(v) for k, v in rest}}
+
+
+def summarize_plan(explain):
+    """'IXSCAN(status_1_created_at_-1__id_-1) <- FETCH <- LIMIT' style summary."""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # aggregate explains nest the planner under the first $cursor stage
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    if planner is None:
+        return None
+
+    stages = []
+    plan = planner.get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)   # SBE wraps the classic plan
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage += f"({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " <- ".join(reversed(stages))
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.threshold_ms = slow_query_threshold_ms
+        self.explain = slow_query_explain
+        self.records = deque(maxlen=slow_query_max_records)
+
+        self._pending = {}   # (connection_id, request_id) -> (command, route)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._db = None
+        # redacted shape -> explained recently; bounded like the records
+        self._explained = TTLCache(maxsize=slow_query_max_records, ttl=slow_query_explain_interval_seconds)
+
+        self._log = None
+
+    def _open_log(self):
+        log = logging.getLogger("slow_queries")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        handler = RotatingFileHandler(
+            slow_query_log_path,
+            maxBytes=slow_query_log_max_bytes,
+            backupCount=slow_query_log_backups,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        return log
+
+    def bind(self, db):
+        """
+        Called from init_db: explain needs the database and the running loop.
+        The log file is opened here rather than at import.
+        """
+        self._db = db
+        self._loop = asyncio.get_running_loop()
+        if self._log is None and slow_query_log_path:
+            self._log = self._open_log()
+
+    # -- listener callbacks (Motor worker threads) --
+    def started(self, event):
+        if event.command_name == "explain":
+            return
+        stats = current_request.get()
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.command,
+                f"{stats.method} {stats.route}" if stats else None,
+            )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        command, route = pending
+        record = {
+            "at": datetime.utcnow().isoformat(),
+            "command": event.command_name,
+            "database": event.database_name,
+            "route": route,
+            "duration_ms": round(duration_ms, 2),
+            "failed": failed,
+            "shape": command_shape(command),
+        }
+        self.records.append(record)
+
+        if self._should_explain(event.command_name, record["shape"]):
+            explain_cmd = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS}
+            asyncio.run_coroutine_threadsafe(self._explain(record, explain_cmd), self._loop)
+        else:
+            self._write(record)
+
+    def _should_explain(self, command_name: str, shape: dict) -> bool:
+        if not (self.explain and command_name in EXPLAINABLE and self._loop and self._db is not None):
+            return False
+        key = json.dumps(shape, sort_keys=True, default=str)
+        with self._lock:
+            if key in self._explained:
+                return False
+            self._explained[key] = True
+        return True
+
+    async def _explain(self, record, command):
+        try:
+            explain = await self._db.command({"explain": command, "verbosity": "queryPlanner"})
+            record["plan"] = summarize_plan(explain)
+        except Exception as exc:
+            record["plan_error"] = str(exc)
+        self._write(record)
+
+    def _write(self, record):
+        if self._log:
+            self._log.info(json.dumps(record, default=str))
+
+    def recent(self, limit: int = 100):
+        return list(reversed(self.records))[:limit]
+
+
+slow_query_recorder = SlowQueryRecorder()
@@ -0,0 +1,80 @@
+import uuid
+
+from cachetools import LRUCache
+
+# -------------------------------------------------------
+# Version counters behind the ETags of the polled list
+# endpoints. Writers bump() the keys they change after the
+# write; readers take version() *before* querying and tag
+# the response with it. A write racing the read then only
+# makes the tag older than the rows (an extra 200 later).
+# Anything cached from a query must carry the version it was
+# read under and be served only while that is still the
+# current one – otherwise rows read before a write could be
+# served under an ETag taken after it.
+#
+# One global sequence numbers every bump. A key remembers
+# the sequence of its last bump; a key not remembered
+# (never bumped, or evicted from the LRU) is pinned to the
+# current sequence when read, which any later bump exceeds.
+#
+# Counters are per process. The epoch in the ETag keeps a
+# restarted process from matching old tags. With several
+# workers/replicas, remote writes only bump here when
+# COMPLAINT_EVENTS_CHANGE_STREAM=1, and only once the stream
+# delivers them – until then a 304 for them can be stale.
+# -------------------------------------------------------
+
+
+class VersionCounters:
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.epoch = uuid.uuid4().hex[:8]
+        self.sequence = 0
+        self._keys = LRUCache(maxsize=max(maxsize, 1))
+        self.not_modified = 0
+
+    def bump(self, *keys):
+        self.sequence += 1
+        for key in keys:
+            self._keys[key] = self.sequence
+
+    def reset(self):
+        """Forget every key: all versions move and every old ETag stops matching."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self.sequence += 1
+        self._keys.clear()
+
+    def version(self, key) -> int:
+        version = self._keys.get(key)
+        if version is None:
+            version = self._keys[key] = self.sequence
+        return version
+
+    def tag(self, version: int) -> str:
+        return f'W/"{self.epoch}-{version}"'
+
+    def etag(self, key) -> str:
+        return self.tag(self.version(key))
+
+    def matches(self, if_none_match: str | None, etag: str) -> bool:
+        """If-None-Match check with weak comparison; counts the hits."""
+        if not if_none_match:
+            return False
+
+        wanted = etag.removeprefix("W/")
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == wanted:
+                self.not_modified += 1
+                return True
+        return False
+
+    def metric_lines(self):
+        label = f'counters="{self.name}"'
+        return [
+            "# TYPE etag_not_modified_total counter",
+            f"etag_not_modified_total{{{label}}} {self.not_modified}",
+            "# TYPE etag_version_sequence gauge",
+            f"etag_version_sequence{{{label}}} {self.sequence}",
+        ]
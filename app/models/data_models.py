@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List
 
 class ComplaintEntry(BaseModel):
     complaint_details: str = Field(..., description="Detailed complaint description")
@@ -12,5 +13,5 @@ class ComplaintStatus(BaseModel):
     mobile_number: str = Field(..., min_length=10, max_length=10, description="Users mobile number")
     complaint_id: str = Field(..., description="User complaint ID")
 
-
-
+class ComplaintStatusBatch(BaseModel):
+    items: List[ComplaintStatus] = Field(..., min_length=1, max_length=200, description="(mobile_number, complaint_id) pairs")
@@ -1,6 +1,7 @@
 from beanie import Document
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from enum import Enum
@@ -17,6 +18,29 @@ class ComplaintStatus(str, Enum):
     CLOSED = "Closed"
 
 
+# -------------------------------------------------------
+# Status Mapper – normalizes whatever the UI / employees
+# stored into one of the canonical labels
+# -------------------------------------------------------
+STATUS_MAP = {
+    "open": "Pending",
+    "pending": "Pending",
+    "in progress": "In Progress",
+    "inprogress": "In Progress",
+    "resolved": "Resolved",
+    "closed": "Closed",
+}
+
+def map_status(input_status: str | None):
+    if not input_status:
+        return "Pending"
+    return STATUS_MAP.get(input_status.lower(), "Pending")
+
+
+# Entering one of these sets resolved_at; leaving them clears it
+RESOLVED_STATUSES = ("Resolved", "Closed")
+
+
 class ComplaintDetails(BaseModel):
     complaint_details: str
     status: str = "Pending"       # Allow any value, no ENUM limit
@@ -25,12 +49,71 @@ class ComplaintDetails(BaseModel):
 
 
 
+# -------------------------------------------------------
+# Customer document. The nested complaints dict is the legacy
+# layout – new complaints live in ComplaintItem.
+# -------------------------------------------------------
 class Complaint(Document):
     name: str = Field(...)
     mobile_number: str = Field(..., min_length=10, max_length=10)
 
-    # complaint_id → ComplaintDetails
-    complaints: Dict[str, ComplaintDetails] = Field(...)
+    # complaint_id → ComplaintDetails (legacy, read-only once migrated)
+    complaints: Dict[str, ComplaintDetails] = Field(default_factory=dict)
+
+    # Flat copy of the complaint_id keys above. Nested dict keys can't be
+    # indexed, so this multikey array is what complaint_id lookups hit.
+    complaint_ids: List[str] = Field(default_factory=list)
+
+    # Every email a complaint here has been assigned to. Only ever grows
+    # ($addToSet), so it is a superset used to narrow assignee queries –
+    # the nested assigned_to is still the source of truth.
+    assignees: List[str] = Field(default_factory=list)
+
+    # Set once the nested complaints have been copied to complaint_items.
+    # Customers created after the split get it on insert.
+    migrated_at: Optional[datetime] = None
 
     class Settings:
         name = "complaints"
+        indexes = [
+            IndexModel([("mobile_number", ASCENDING)], unique=True),
+            IndexModel([("complaint_ids", ASCENDING)]),
+            IndexModel([("assignees", ASCENDING)]),
+            IndexModel([("migrated_at", ASCENDING)]),
+        ]
+
+
+class StatusChange(BaseModel):
+    status: str
+    at: datetime
+
+
+# -------------------------------------------------------
+# One document per complaint, _id = complaint_id.
+# References the customer by mobile_number. status is always
+# stored as a map_status() label so it can be indexed.
+# -------------------------------------------------------
+class ComplaintItem(Document):
+    id: str = Field(...)
+    mobile_number: str = Field(..., min_length=10, max_length=10)
+    name: str
+    complaint_details: str
+    status: str = "Pending"
+    assigned_to: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Every status the complaint entered and when, starting with its
+    # creation. Empty for complaints migrated from the legacy layout,
+    # which never recorded transitions.
+    status_history: List[StatusChange] = Field(default_factory=list)
+    # When it moved into RESOLVED_STATUSES; None while open or unknown
+    resolved_at: Optional[datetime] = None
+
+    class Settings:
+        name = "complaint_items"
+        indexes = [
+            IndexModel([("mobile_number", ASCENDING), ("created_at", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("assigned_to", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
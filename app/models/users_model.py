@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import ASCENDING, IndexModel
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 
@@ -12,6 +13,9 @@ class User(Document):
 
     class Settings:
         name = "users"   # MongoDB collection name
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+        ]
 
 
 # For registration input
@@ -53,4 +57,7 @@ class UserInDB(Document):
     created_at: datetime = datetime.utcnow()
 
     class Settings:
-        name = "users"
\ No newline at end of file
+        name = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+        ]
\ No newline at end of file
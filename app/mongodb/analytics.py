@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from backend.mongodb_service.app.mongodb.db_connections import (
+    init_db,
+    close_db,
+    get_db,
+    complaint_items_col,
+)
+
+
+# ===================================================================
+# Complaint analytics – precomputed per-bucket rollups
+#
+# complaint_rollups: one document per hour and per day
+#   {"_id": "day|2026-10-18", "granularity": "day", "bucket": <datetime>,
+#    "created": 40, "resolved": 31}
+#
+# resolution_rollups: one document per day and assignee, holding the
+# time-to-resolve (seconds) of every complaint resolved that day
+#   {"_id": "2026-10-18|a@x.com", "bucket": <datetime>, "assigned_to": "a@x.com",
+#    "seconds": [5400.0, 86400.0, ...]}
+#
+# The repository's write hook increments them as complaints are created
+# and resolved; the range queries below read nothing else. Reopening a
+# complaint does not take back its resolution – "resolved" counts
+# resolution events. Backfill / rebuild from the complaints:
+#
+#   python -m backend.mongodb_service.app.mongodb.analytics
+# ===================================================================
+ROLLUPS_COLLECTION = "complaint_rollups"
+RESOLUTIONS_COLLECTION = "resolution_rollups"
+
+# granularity -> key format; $dateToString understands the same directives
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+}
+
+
+def rollups_col():
+    return get_db()[ROLLUPS_COLLECTION]
+
+
+def resolutions_col():
+    return get_db()[RESOLUTIONS_COLLECTION]
+
+
+async def ensure_indexes():
+    await rollups_col().create_indexes([IndexModel([("granularity", ASCENDING), ("bucket", ASCENDING)])])
+    await resolutions_col().create_indexes([IndexModel([("bucket", ASCENDING)])])
+
+
+def bucket_key(at: datetime, granularity: str) -> str:
+    return at.strftime(BUCKET_FORMATS[granularity])
+
+
+def bucket_start(key: str, granularity: str) -> datetime:
+    return datetime.strptime(key, BUCKET_FORMATS[granularity])
+
+
+# -----------------------------------
+# Incremental updates (write hook)
+# -----------------------------------
+def _rollup_inc(granularity: str, key: str, fields: dict):
+    return UpdateOne(
+        {"_id": f"{granularity}|{key}"},
+        {
+            "$inc": fields,
+            "$setOnInsert": {"granularity": granularity, "bucket": bucket_start(key, granularity)},
+        },
+        upsert=True,
+    )
+
+
+def _resolution_push(key: str, assigned_to: str | None, seconds: list):
+    return UpdateOne(
+        {"_id": f"{key}|{assigned_to or ''}"},
+        {
+            "$push": {"seconds": {"$each": seconds}},
+            "$setOnInsert": {"bucket": bucket_start(key, "day"), "assigned_to": assigned_to},
+        },
+        upsert=True,
+    )
+
+
+async def record_rollups(changes):
+    """
+    changes: the (before, after) pairs of the repository write hook.
+    A new complaint counts as created in the buckets of its created_at;
+    one whose resolved_at just got set counts as resolved there, and its
+    time-to-resolve goes to its assignee's day.
+    """
+    counts = {}        # (granularity, key) -> {"created": n, "resolved": n}
+    resolutions = {}   # (day key, assigned_to) -> [seconds]
+
+    for before, after in changes:
+        if after is None:
+            continue
+
+        events = []
+        if before is None and after.get("created_at"):
+            events.append(("created", after["created_at"]))
+
+        resolved_at = after.get("resolved_at")
+        if resolved_at and not (before or {}).get("resolved_at"):
+            events.append(("resolved", resolved_at))
+            if after.get("created_at"):
+                seconds = (resolved_at - after["created_at"]).total_seconds()
+                day = bucket_key(resolved_at, "day")
+                resolutions.setdefault((day, after.get("assigned_to")), []).append(seconds)
+
+        for field, at in events:
+            for granularity in BUCKET_FORMATS:
+                entry = counts.setdefault((granularity, bucket_key(at, granularity)), {})
+                entry[field] = entry.get(field, 0) + 1
+
+    writes = []
+    rollup_ops = [_rollup_inc(g, key, fields) for (g, key), fields in counts.items()]
+    if rollup_ops:
+        writes.append(rollups_col().bulk_write(rollup_ops, ordered=False))
+    resolution_ops = [_resolution_push(day, who, seconds) for (day, who), seconds in resolutions.items()]
+    if resolution_ops:
+        writes.append(resolutions_col().bulk_write(resolution_ops, ordered=False))
+
+    await asyncio.gather(*writes)
+
+
+# -----------------------------------
+# Range queries – rollup documents only
+# -----------------------------------
+async def complaint_trends(granularity: str, start: datetime, end: datetime):
+    """Created / resolved per bucket in [start, end), oldest first. Empty buckets are omitted."""
+    cursor = rollups_col().find(
+        {"granularity": granularity, "bucket": {"$gte": start, "$lt": end}},
+        {"_id": 0, "bucket": 1, "created": 1, "resolved": 1},
+    ).sort("bucket", ASCENDING)
+
+    return [
+        {"bucket": doc["bucket"], "created": doc.get("created", 0), "resolved": doc.get("resolved", 0)}
+        async for doc in cursor
+    ]
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+async def resolution_times(start: datetime, end: datetime):
+    """
+    Complaints resolved per assignee in [start, end) (whole days) with
+    the median time-to-resolve in seconds, busiest assignee first.
+    """
+    cursor = resolutions_col().find(
+        {"bucket": {"$gte": start, "$lt": end}},
+        {"_id": 0, "assigned_to": 1, "seconds": 1},
+    )
+
+    seconds_by_assignee = {}
+    async for doc in cursor:
+        seconds_by_assignee.setdefault(doc.get("assigned_to"), []).extend(doc.get("seconds", []))
+
+    rows = [
+        {"assigned_to": who, "resolved": len(seconds), "median_seconds": _median(seconds)}
+        for who, seconds in seconds_by_assignee.items()
+        if seconds
+    ]
+    rows.sort(key=lambda row: row["resolved"], reverse=True)
+    return rows
+
+
+# -----------------------------------
+# Backfill / rebuild from the complaints
+# -----------------------------------
+async def rebuild_rollups():
+    """
+    Recompute both rollup collections from scratch. Creation counts cover
+    legacy entries too (while legacy reads are on); resolutions need
+    resolved_at, so complaints resolved before it was recorded only show
+    up as created. Increments made while this runs are lost, so run it
+    when writes are quiet. Returns the number of documents written.
+    """
+    # Imported here: the repository imports this module for its write hooks
+    from backend.mongodb_service.app.mongodb.complaint_repository import rows_pipeline
+
+    def per_bucket(field, granularity):
+        return [
+            {"$match": {field: {"$type": "date"}}},
+            {
+                "$group": {
+                    "_id": {"$dateToString": {"date": f"${field}", "format": BUCKET_FORMATS[granularity]}},
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+
+    counts = {}
+    for granularity in BUCKET_FORMATS:
+        created = await complaint_items_col().aggregate(
+            rows_pipeline({}) + per_bucket("created_at", granularity)
+        ).to_list(None)
+        resolved = await complaint_items_col().aggregate(
+            per_bucket("resolved_at", granularity)
+        ).to_list(None)
+
+        for field, groups in (("created", created), ("resolved", resolved)):
+            for group in groups:
+                doc = counts.setdefault(
+                    f"{granularity}|{group['_id']}",
+                    {
+                        "granularity": granularity,
+                        "bucket": bucket_start(group["_id"], granularity),
+                        "created": 0,
+                        "resolved": 0,
+                    },
+                )
+                doc[field] = group["count"]
+
+    resolutions = await complaint_items_col().aggregate([
+        {"$match": {"resolved_at": {"$type": "date"}, "created_at": {"$type": "date"}}},
+        {
+            "$group": {
+                "_id": {
+                    "day": {"$dateToString": {"date": "$resolved_at", "format": BUCKET_FORMATS["day"]}},
+                    "assigned_to": {"$ifNull": ["$assigned_to", None]},
+                },
+                "seconds": {"$push": {"$divide": [{"$subtract": ["$resolved_at", "$created_at"]}, 1000]}},
+            }
+        },
+    ]).to_list(None)
+
+    await asyncio.gather(rollups_col().delete_many({}), resolutions_col().delete_many({}))
+    if counts:
+        await rollups_col().insert_many([{"_id": key, **doc} for key, doc in counts.items()], ordered=False)
+    if resolutions:
+        await resolutions_col().insert_many(
+            [
+                {
+                    "_id": f"{group['_id']['day']}|{group['_id']['assigned_to'] or ''}",
+                    "bucket": bucket_start(group["_id"]["day"], "day"),
+                    "assigned_to": group["_id"]["assigned_to"],
+                    "seconds": group["seconds"],
+                }
+                for group in resolutions
+            ],
+            ordered=False,
+        )
+    return len(counts) + len(resolutions)
+
+
+async def _run_cli():
+    await init_db()
+    try:
+        started = time.perf_counter()
+        written = await rebuild_rollups()
+        print(f"📊 Rebuilt {written} analytics rollups in {time.perf_counter() - started:.1f}s")
+    finally:
+        await close_db()
+
+
+def main():
+    argparse.ArgumentParser(description="Backfill / rebuild the complaint analytics rollups").parse_args()
+    asyncio.run(_run_cli())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import csv
+import json
+import time
+
+from pydantic import ValidationError
+
+from backend.mongodb_service.app.core.config import bulk_ingest_batch_size
+from backend.mongodb_service.app.models.data_models import RegisterComplaint
+from backend.mongodb_service.app.mongodb.complaint_repository import register_complaints_bulk
+
+
+# ===================================================================
+# Bulk complaint ingestion (call-center nightly export)
+#
+#   NDJSON: one RegisterComplaint per line
+#           {"name": ..., "mobile_number": ..., "complaints": {"complaint_details": ...}}
+#   CSV:    header name,mobile_number,complaint_details
+#
+# Used by POST /register-complaints-bulk/ and, from a shell:
+#   python -m backend.mongodb_service.app.mongodb.bulk_ingest export.csv --format csv
+# ===================================================================
+FORMATS = ("ndjson", "csv")
+
+
+def _validation_message(exc: ValidationError):
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def iter_records(text_file, fmt: str):
+    """
+    Yields (row_number, RegisterComplaint | error string) from an open
+    text file. Row numbers are 1-based data rows (CSV header excluded).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(text_file)
+        for row_number, row in enumerate(reader, start=1):
+            try:
+                yield row_number, RegisterComplaint(
+                    name=row.get("name"),
+                    mobile_number=row.get("mobile_number"),
+                    complaints={"complaint_details": row.get("complaint_details")},
+                )
+            except ValidationError as exc:
+                yield row_number, _validation_message(exc)
+        return
+
+    row_number = 0
+    for line in text_file:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            yield row_number, RegisterComplaint.model_validate_json(line)
+        except ValidationError as exc:
+            yield row_number, _validation_message(exc)
+
+
+async def ingest_records(records, batch_size: int = bulk_ingest_batch_size):
+    """
+    Writes valid records in batches of batch_size and reports every row:
+    {"row": n, "complaint_id": ...} or {"row": n, "error": ...}.
+    """
+    results = []
+    batch = []
+    started = time.perf_counter()
+
+    async def flush():
+        try:
+            outcomes = await register_complaints_bulk([record for _, record in batch])
+        except Exception as exc:
+            # Keep going – the report still covers every row
+            outcomes = [{"error": f"batch failed: {exc}"}] * len(batch)
+        for (row_number, _), outcome in zip(batch, outcomes):
+            if isinstance(outcome, str):
+                results.append({"row": row_number, "complaint_id": outcome})
+            else:
+                results.append({"row": row_number, **outcome})
+        batch.clear()
+
+    for row_number, record in records:
+        if isinstance(record, str):
+            results.append({"row": row_number, "error": record})
+            continue
+
+        batch.append((row_number, record))
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    results.sort(key=lambda r: r["row"])
+    failed = sum(1 for r in results if "error" in r)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rows": len(results),
+        "inserted": len(results) - failed,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "results": results,
+    }
+
+
+# -----------------------------------
+# CLI
+# -----------------------------------
+async def _run_cli(path: str, fmt: str, batch_size: int, report: str | None):
+    from backend.mongodb_service.app.mongodb.db_connections import init_db, close_db
+
+    await init_db()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as text_file:
+            summary = await ingest_records(iter_records(text_file, fmt), batch_size)
+    finally:
+        await close_db()
+
+    if report:
+        with open(report, "w", encoding="utf-8") as out:
+            json.dump(summary, out, indent=2)
+
+    print(f"📥 {summary['inserted']} inserted, {summary['failed']} failed in {summary['seconds']}s")
+    for row in summary["results"]:
+        if "error" in row:
+            print(f"   row {row['row']}: {row['error']}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-register complaints from NDJSON or CSV")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=bulk_ingest_batch_size)
+    parser.add_argument("--report", help="write the per-row JSON report here")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    summary = asyncio.run(_run_cli(args.path, fmt, args.batch_size, args.report))
+    raise SystemExit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
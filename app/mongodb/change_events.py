@@ -0,0 +1,87 @@
+import asyncio
+
+from pymongo.errors import PyMongoError
+
+from backend.mongodb_service.app.mongodb.db_connections import complaint_items_col
+from backend.mongodb_service.app.mongodb.complaint_repository import (
+    EVENT_FIELDS,
+    complaint_events,
+    complaint_event,
+    bump_complaint_versions,
+    invalidate_complaint,
+    resync_complaints,
+)
+
+
+# ===================================================================
+# Change-stream feed for the complaint event bus
+#
+# With COMPLAINT_EVENTS_CHANGE_STREAM=1 every process watches
+# complaint_items and publishes what MongoDB reports, so listeners see
+# writes made by any worker or replica, and the read cache and the list
+# ETag versions follow them. Needs a replica set. Without pre-images (MongoDB 6.0+ and
+# enabled per collection) the document as it was is unknown, so
+# previous_status / previous_assigned_to stay None.
+#
+# After an error the watch resumes from the last token seen. Once that
+# token has fallen off the oplog it can never resume: the watch restarts
+# from now and, since changes were missed, every cached read, ETag and
+# listener is reset (resync_complaints).
+# ===================================================================
+RETRY_SECONDS = 5
+
+# InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost
+RESUME_LOST_CODES = {260, 280, 286}
+
+
+def event_from_change(change):
+    document = change.get("fullDocument")
+    if not document:
+        return None
+
+    if change["operationType"] == "insert":
+        return complaint_event("created", [], document)
+
+    if change["operationType"] == "replace":
+        return complaint_event("updated", list(EVENT_FIELDS), document)
+
+    updated = (change.get("updateDescription") or {}).get("updatedFields", {})
+    changed = [field for field in EVENT_FIELDS if field in updated]
+    return complaint_event("updated", changed, document) if changed else None
+
+
+async def watch_complaint_changes():
+    """
+    Runs until cancelled; resumes after errors from the last token seen,
+    or from now once that token is gone.
+    """
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    resume_token = None
+
+    while True:
+        try:
+            async with complaint_items_col().watch(
+                pipeline,
+                full_document="updateLookup",
+                resume_after=resume_token,
+            ) as stream:
+                print("📡 Watching complaint_items for change events")
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    document = change.get("fullDocument")
+                    if document:
+                        # Writes by other workers/replicas drop cached reads
+                        # and move the ETags too
+                        invalidate_complaint(document["mobile_number"], document["_id"])
+                        bump_complaint_versions(document["mobile_number"])
+                    event = event_from_change(change)
+                    if event:
+                        complaint_events.publish(event)
+        except PyMongoError as exc:
+            if resume_token is not None and getattr(exc, "code", None) in RESUME_LOST_CODES:
+                print(f"⚠️ Complaint change stream cannot resume, restarting from now: {exc}")
+                resume_token = None
+                resync_complaints()
+                continue
+            print(f"⚠️ Complaint change stream failed, retrying in {RETRY_SECONDS}s: {exc}")
+            await asyncio.sleep(RETRY_SECONDS)
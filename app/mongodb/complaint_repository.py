@@ -0,0 +1,997 @@
+import asyncio
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from backend.mongodb_service.app.core.cache import MISSING, ReadCache
+from backend.mongodb_service.app.core.events import EventBus
+from backend.mongodb_service.app.core.versions import VersionCounters
+from backend.mongodb_service.app.core.metrics import register_collector
+from backend.mongodb_service.app.core.config import (
+    complaint_legacy_reads,
+    complaint_cache_ttl_seconds,
+    complaint_cache_max_entries,
+    complaint_events_queue_size,
+    complaint_events_change_stream,
+    list_version_max_keys,
+    write_queue_max_batch,
+    write_queue_max_delay_ms,
+)
+from backend.mongodb_service.app.models.db_schemas import STATUS_MAP, RESOLVED_STATUSES, map_status
+from backend.mongodb_service.app.mongodb.db_connections import (
+    complaints_col,
+    complaint_items_col,
+)
+from backend.mongodb_service.app.mongodb.dashboard_counters import (
+    counter_deltas,
+    apply_counter_deltas,
+)
+from backend.mongodb_service.app.mongodb.analytics import record_rollups
+from backend.mongodb_service.app.mongodb.write_queue import WriteQueue
+
+
+# ===================================================================
+# Complaint repository – every complaint read / write goes through here.
+#
+# Complaints live one per document in complaint_items (_id = complaint_id)
+# and reference the customer in "complaints" by mobile_number. Customers
+# created before the split still carry a nested complaints dict; until
+# migrate_complaints has copied them (migrated_at set), reads union those
+# entries in and the first write to one migrates its customer.
+# ===================================================================
+
+
+# -----------------------------------
+# Read cache for the chatbot's hot paths
+#   ("status", mobile_number, complaint_id) -> status dict
+#   ("customer", mobile_number)             -> (list version, rows)
+# Entries are only stored when the customer's list version did not move
+# during the query, so a read racing a write never caches pre-write data.
+# -----------------------------------
+complaint_cache = ReadCache(
+    "complaints",
+    maxsize=complaint_cache_max_entries,
+    ttl=complaint_cache_ttl_seconds,
+)
+register_collector("complaint_cache", complaint_cache.metric_lines)
+
+
+def invalidate_complaint(mobile_number: str, complaint_id: str | None = None):
+    keys = [("customer", mobile_number)]
+    if complaint_id:
+        keys.append(("status", mobile_number, complaint_id))
+    complaint_cache.invalidate(*keys)
+
+
+# -----------------------------------
+# Versions behind the list ETags
+#   "complaints"              -> /admin/complaints
+#   ("customer", mobile)      -> /user/complaints
+#   "employees"               -> /employees/list
+# -----------------------------------
+list_versions = VersionCounters("lists", maxsize=list_version_max_keys)
+register_collector("list_versions", list_versions.metric_lines)
+
+
+def bump_complaint_versions(mobile_number: str):
+    list_versions.bump("complaints", ("customer", mobile_number))
+
+
+def customer_version(mobile_number: str) -> int:
+    return list_versions.version(("customer", mobile_number))
+
+
+# -----------------------------------
+# Live change events for SSE / WebSocket listeners
+# -----------------------------------
+complaint_events = EventBus("complaints", queue_size=complaint_events_queue_size)
+register_collector("complaint_events", complaint_events.metric_lines)
+
+
+EVENT_FIELDS = ("status", "assigned_to")
+
+
+def resync_complaints():
+    """
+    For when writes may have gone unseen (e.g. the change stream lost its
+    place): drop every cached read, move every list version and have all
+    listeners refetch.
+    """
+    complaint_cache.clear()
+    list_versions.reset()
+    complaint_events.resync()
+
+
+def change_event(before: dict | None, after: dict):
+    """
+    Event for one complaint change, or None when neither status nor
+    assignee moved.
+    """
+    if before is None:
+        return complaint_event("created", [], after)
+
+    changed = [field for field in EVENT_FIELDS if before.get(field) != after.get(field)]
+    return complaint_event("updated", changed, after, before) if changed else None
+
+
+def complaint_event(kind: str, changed: list, after: dict, before: dict | None = None):
+    """The complaint in listing-row shape plus what changed."""
+    return {
+        "type": kind,
+        "changed": changed,
+        "complaint_id": after["_id"],
+        "name": after.get("name"),
+        "mobile": after.get("mobile_number"),
+        "issue": after.get("complaint_details"),
+        "status": after.get("status"),
+        "assigned_to": after.get("assigned_to"),
+        "created_at": after.get("created_at"),
+        "previous_status": before.get("status") if before else None,
+        "previous_assigned_to": before.get("assigned_to") if before else None,
+    }
+
+
+# -----------------------------------
+# Write hook – every complaint write reports here
+# -----------------------------------
+async def complaints_changed(changes):
+    """
+    changes: (before, after) pairs of complaint_items documents (at least
+    _id, mobile_number, status, assigned_to); before is None for a new
+    complaint; after also carries created_at, resolved_at and the row
+    fields. Drops the cached reads, bumps the list versions, publishes
+    change events (unless a change stream does), moves the dashboard
+    counters and feeds the analytics rollups.
+    """
+    for before, after in changes:
+        doc = after or before
+        invalidate_complaint(doc["mobile_number"], doc["_id"])
+        bump_complaint_versions(doc["mobile_number"])
+
+        if after and not complaint_events_change_stream:
+            event = change_event(before, after)
+            if event:
+                complaint_events.publish(event)
+
+    await asyncio.gather(
+        apply_counter_deltas(counter_deltas(changes)),
+        record_rollups(changes),
+    )
+
+
+# -----------------------------------
+# Row shape shared by every listing
+# -----------------------------------
+ITEM_ROW_PROJECTION = {
+    "_id": 0,
+    "complaint_id": "$_id",
+    "name": 1,
+    "mobile": "$mobile_number",
+    "issue": "$complaint_details",
+    "status": 1,
+    "assigned_to": 1,
+    "created_at": 1,
+}
+
+
+def complaint_path(complaint_id: str) -> str:
+    """
+    Dotted path of one entry inside the legacy complaints dict.
+    complaint_id ends up in a field path, so reject anything that could
+    address a different field.
+    """
+    if not complaint_id or "." in complaint_id or complaint_id.startswith("$"):
+        raise HTTPException(status_code=400, detail="Invalid complaint_id")
+    return f"complaints.{complaint_id}"
+
+
+def new_complaint_item(complaint_id: str, name: str, mobile_number: str, complaint_details: str):
+    created_at = datetime.utcnow()           # never None
+    return {
+        "_id": complaint_id,
+        "mobile_number": mobile_number,
+        "name": name,
+        "complaint_details": complaint_details,
+        "status": "Pending",
+        "assigned_to": None,
+        "created_at": created_at,
+        "status_history": [{"status": "Pending", "at": created_at}],
+        "resolved_at": None,
+    }
+
+
+def legacy_entry_to_item(customer, entry):
+    return {
+        "mobile_number": customer["mobile_number"],
+        "name": customer.get("name"),
+        "complaint_details": entry.get("complaint_details"),
+        "status": map_status(entry.get("status")),
+        "assigned_to": entry.get("assigned_to"),
+        "created_at": entry.get("created_at"),
+    }
+
+
+# -----------------------------------
+# Legacy layout – flatten server-side
+# -----------------------------------
+def status_label_expr(field: str):
+    """
+    Aggregation twin of map_status(): lower-cases the stored status and
+    maps it through STATUS_MAP, falling back to "Pending".
+    """
+    labels = {}
+    for raw, label in STATUS_MAP.items():
+        labels.setdefault(label, []).append(raw)
+
+    lowered = {"$toLower": {"$ifNull": [field, ""]}}
+    return {
+        "$switch": {
+            "branches": [
+                {"case": {"$in": [lowered, raws]}, "then": label}
+                for label, raws in labels.items()
+            ],
+            "default": "Pending",
+        }
+    }
+
+
+def flatten_legacy_pipeline(customer_filter: dict | None = None):
+    """
+    One row per nested entry of customers not migrated yet, in the same
+    shape as ITEM_ROW_PROJECTION.
+    """
+    return [
+        {"$match": {"migrated_at": None, **(customer_filter or {})}},
+        {
+            "$project": {
+                "name": 1,
+                "mobile_number": 1,
+                "entry": {"$objectToArray": {"$ifNull": ["$complaints", {}]}},
+            }
+        },
+        {"$unwind": "$entry"},
+        {
+            "$project": {
+                "_id": 0,
+                "complaint_id": "$entry.k",
+                "name": "$name",
+                "mobile": "$mobile_number",
+                "issue": "$entry.v.complaint_details",
+                "status": status_label_expr("$entry.v.status"),
+                "assigned_to": "$entry.v.assigned_to",
+                "created_at": "$entry.v.created_at",
+            }
+        },
+    ]
+
+
+# -----------------------------------
+# Keyset cursor helpers
+# -----------------------------------
+def encode_cursor(row) -> str:
+    created_at = row.get("created_at")
+    payload = {
+        "t": created_at.isoformat() if created_at else None,
+        "id": row["complaint_id"],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        if not isinstance(payload["id"], str):
+            raise TypeError("cursor id must be a string")
+        return created_at, payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(created_at, complaint_id, descending: bool, id_field: str):
+    """
+    Rows strictly after (created_at, complaint_id) in sort order.
+    Missing created_at sorts lowest, like MongoDB does.
+    """
+    op = "$lt" if descending else "$gt"
+    same_time = {"created_at": created_at, id_field: {op: complaint_id}}
+
+    if created_at is None:
+        if descending:
+            return same_time
+        return {"$or": [same_time, {"created_at": {"$ne": None}}]}
+
+    branches = [{"created_at": {op: created_at}}, same_time]
+    if descending:
+        branches.append({"created_at": None})
+    return {"$or": branches}
+
+
+def parse_status(status: str | None) -> str:
+    """
+    Canonical label for a status sent by a client. Unlike map_status(),
+    which reads stored legacy values, an unknown value is a 400 – a typo
+    must not quietly list or store Pending.
+    """
+    if not status or status.lower() not in STATUS_MAP:
+        raise HTTPException(status_code=400, detail=f"Unknown status {status!r}")
+    return STATUS_MAP[status.lower()]
+
+
+def status_filter(status: str | None):
+    """?status= of the listings: None for "any", else parse_status()."""
+    return parse_status(status) if status else None
+
+
+def _row_filters(status, assigned_to, after, descending: bool, id_field: str):
+    filters = {}
+    if status:
+        filters["status"] = status
+    if assigned_to:
+        filters["assigned_to"] = assigned_to
+    if after:
+        filters.update(_after_cursor(*after, descending, id_field))
+    return filters
+
+
+# -----------------------------------
+# Dual-read pipeline
+# -----------------------------------
+def rows_pipeline(
+    item_filter: dict,
+    legacy_customer_filter: dict | None = None,
+    legacy_row_filter: dict | None = None,
+    sort: int | None = None,
+    limit: int | None = None,
+):
+    """
+    Aggregation over complaint_items producing listing rows. While legacy
+    reads are on, un-migrated nested entries are appended via $unionWith.
+    Each branch sorts and cuts on its own so the indexes do the work and
+    the merge only sees 2 * limit rows.
+    """
+    def sort_and_cut(stages, id_field):
+        if sort:
+            stages.append({"$sort": {"created_at": sort, id_field: sort}})
+        if limit:
+            stages.append({"$limit": limit})
+        return stages
+
+    pipeline = sort_and_cut([{"$match": item_filter}], "_id")
+    pipeline.append({"$project": ITEM_ROW_PROJECTION})
+
+    if not complaint_legacy_reads:
+        return pipeline
+
+    legacy = flatten_legacy_pipeline(legacy_customer_filter)
+    if legacy_row_filter:
+        legacy.append({"$match": legacy_row_filter})
+
+    pipeline.append(
+        {"$unionWith": {"coll": complaints_col().name, "pipeline": sort_and_cut(legacy, "complaint_id")}}
+    )
+    return sort_and_cut(pipeline, "complaint_id")
+
+
+# -----------------------------------
+# Migration
+# -----------------------------------
+async def migrate_customers(customers) -> int:
+    """
+    Copy the nested complaints of the given raw customer documents into
+    complaint_items and mark them migrated. $setOnInsert keeps it
+    idempotent and never overwrites an item that was updated since.
+    """
+    ops = [
+        UpdateOne(
+            {"_id": complaint_id},
+            {"$setOnInsert": legacy_entry_to_item(customer, entry)},
+            upsert=True,
+        )
+        for customer in customers
+        for complaint_id, entry in (customer.get("complaints") or {}).items()
+    ]
+
+    if ops:
+        await complaint_items_col().bulk_write(ops, ordered=False)
+
+    await complaints_col().update_many(
+        {"_id": {"$in": [customer["_id"] for customer in customers]}},
+        {"$set": {"migrated_at": datetime.utcnow()}},
+    )
+    return len(ops)
+
+
+async def migrate_owner_of(complaint_id: str) -> bool:
+    """Migrate the un-migrated customer holding complaint_id, if any."""
+    customer = await complaints_col().find_one(
+        {"complaint_ids": complaint_id, "migrated_at": None},
+        {"name": 1, "mobile_number": 1, "complaints": 1},
+    )
+    if not customer:
+        return False
+
+    await migrate_customers([customer])
+    return True
+
+
+# -----------------------------------
+# Check if user exists
+# -----------------------------------
+async def check_user_exists(mobile_number: str):
+    if not mobile_number:
+        raise HTTPException(status_code=400, detail="Mobile number missing")
+
+    user = await complaints_col().find_one({"mobile_number": mobile_number}, {"_id": 1})
+    return str(user["_id"]) if user else False
+
+
+# -----------------------------------
+# Register Complaint (new or existing user)
+# -----------------------------------
+def new_customer_fields(name: str):
+    return {
+        "name": name,
+        "complaints": {},
+        "complaint_ids": [],
+        "assignees": [],
+        "migrated_at": datetime.utcnow(),   # nothing to migrate
+    }
+
+
+async def _upsert_customer(name: str, mobile_number: str):
+    """
+    Create the customer on first contact. The unique index on
+    mobile_number keeps concurrent first complaints from creating twins.
+    Returns True if the customer was created.
+    """
+    try:
+        result = await complaints_col().update_one(
+            {"mobile_number": mobile_number},
+            {"$setOnInsert": new_customer_fields(name)},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # Lost the insert race – the other request created it
+        return False
+
+    return result.upserted_id is not None
+
+
+async def register_complaint(data):
+    """
+    Customer upsert and complaint insert are independent writes, so they
+    go out concurrently – one round trip of latency.
+    """
+    complaint_id = str(uuid.uuid4())
+    item = new_complaint_item(
+        complaint_id,
+        data.name,
+        data.mobile_number,
+        data.complaints.complaint_details,
+    )
+
+    async def insert_item():
+        await complaint_items_col().insert_one(item)
+        await complaints_changed([(None, item)])
+
+    created, _ = await asyncio.gather(
+        _upsert_customer(data.name, data.mobile_number),
+        insert_item(),
+    )
+
+    return {
+        "message": "Success" if created else "New complaint added",
+        "complaint_id": complaint_id
+    }
+
+
+# -----------------------------------
+# Register many complaints (bulk ingestion)
+# -----------------------------------
+async def _bulk_write_errors(collection, ops):
+    """Run an unordered bulk_write and return {op index: error message}."""
+    if not ops:
+        return {}
+    try:
+        await collection.bulk_write(ops, ordered=False)
+    except BulkWriteError as exc:
+        return {err["index"]: err for err in exc.details.get("writeErrors", [])}
+    return {}
+
+
+async def register_complaints_bulk(records):
+    """
+    records: list of RegisterComplaint. One unordered bulk_write inserts
+    the complaint items, another upserts each distinct customer once –
+    both in flight together. Returns, in input order, the new complaint_id
+    or {"error": ...} for each record. A row whose customer could not be
+    written is reported failed but keeps its complaint_id – the complaint
+    itself was stored.
+    """
+    complaint_ids = [str(uuid.uuid4()) for _ in records]
+
+    items = [
+        new_complaint_item(cid, r.name, r.mobile_number, r.complaints.complaint_details)
+        for cid, r in zip(complaint_ids, records)
+    ]
+    item_ops = [InsertOne(item) for item in items]
+
+    # Group by mobile_number: first name seen wins, as with single upserts
+    customers = {}
+    for r in records:
+        customers.setdefault(r.mobile_number, r.name)
+    customer_ops = [
+        UpdateOne({"mobile_number": mobile}, {"$setOnInsert": new_customer_fields(name)}, upsert=True)
+        for mobile, name in customers.items()
+    ]
+
+    item_errors, customer_errors = await asyncio.gather(
+        _bulk_write_errors(complaint_items_col(), item_ops),
+        _bulk_write_errors(complaints_col(), customer_ops),
+        return_exceptions=True,
+    )
+    if isinstance(item_errors, Exception):
+        # Nothing known about which items made it – all rows failed
+        return [{"error": f"complaint write failed: {item_errors}"} for _ in records]
+
+    # Whatever was inserted exists now, so the hook hears about it even if
+    # the customer side failed
+    await complaints_changed([(None, item) for i, item in enumerate(items) if i not in item_errors])
+
+    # Duplicate keys on customers only mean a concurrent writer created them
+    if isinstance(customer_errors, Exception):
+        failed_customers = {mobile: str(customer_errors) for mobile in customers}
+    else:
+        mobiles = list(customers)
+        failed_customers = {
+            mobiles[index]: err.get("errmsg", "write failed")
+            for index, err in customer_errors.items()
+            if err.get("code") != 11000
+        }
+
+    results = []
+    for i, (cid, r) in enumerate(zip(complaint_ids, records)):
+        if i in item_errors:
+            results.append({"error": item_errors[i].get("errmsg", "write failed")})
+        elif r.mobile_number in failed_customers:
+            results.append({
+                "complaint_id": cid,
+                "error": f"customer write failed: {failed_customers[r.mobile_number]}",
+            })
+        else:
+            results.append(cid)
+    return results
+
+
+# -----------------------------------
+# Update status / assignee
+# -----------------------------------
+# What complaints_changed needs of a complaint
+CHANGE_FIELDS = {
+    "mobile_number": 1,
+    "name": 1,
+    "complaint_details": 1,
+    "status": 1,
+    "assigned_to": 1,
+    "created_at": 1,
+    "resolved_at": 1,
+}
+
+
+def _status_update(fields: dict, now: datetime):
+    """
+    Update pipeline for the $set of fields. A status that differs from
+    the stored one is appended to status_history. Entering
+    RESOLVED_STATUSES from outside them stamps resolved_at; a resolved
+    status sent to an already resolved complaint keeps resolved_at as it
+    is – even null, as on migrated legacy items, so no resolution is
+    invented. Any other status clears it. Values go in as $literal so
+    user input can't be read as an expression.
+    """
+    stage = {key: {"$literal": value} for key, value in fields.items()}
+
+    if "status" in fields:
+        status = fields["status"]
+        history = {"$ifNull": ["$status_history", []]}
+        stage["status_history"] = {
+            "$cond": [
+                {"$ne": ["$status", status]},
+                {"$concatArrays": [history, [{"status": status, "at": now}]]},
+                history,
+            ]
+        }
+        if status in RESOLVED_STATUSES:
+            stage["resolved_at"] = {
+                "$cond": [
+                    {"$in": ["$status", list(RESOLVED_STATUSES)]},
+                    {"$ifNull": ["$resolved_at", None]},
+                    now,
+                ]
+            }
+        else:
+            stage["resolved_at"] = None
+
+    return [{"$set": stage}]
+
+
+def _after_update(before: dict, fields: dict, now: datetime):
+    """Python twin of _status_update for the write hook."""
+    after = {**before, **fields}
+    if "status" in fields:
+        if fields["status"] not in RESOLVED_STATUSES:
+            after["resolved_at"] = None
+        elif before.get("status") in RESOLVED_STATUSES:
+            after["resolved_at"] = before.get("resolved_at")
+        else:
+            after["resolved_at"] = now
+    return after
+
+
+async def _find_change_fields(complaint_ids):
+    cursor = complaint_items_col().find({"_id": {"$in": complaint_ids}}, CHANGE_FIELDS)
+    return {doc["_id"]: doc async for doc in cursor}
+
+
+# A complaint another writer keeps changing under us gets this many tries
+MAX_UPDATE_ATTEMPTS = 3
+
+
+async def _compare_and_set(complaint_id: str, before: dict, fields: dict, now: datetime) -> bool:
+    """Applies fields only while status / assigned_to are still as read; True if it did."""
+    result = await complaint_items_col().update_one(
+        {"_id": complaint_id, "status": before.get("status"), "assigned_to": before.get("assigned_to")},
+        _status_update(fields, now),
+    )
+    return result.matched_count == 1
+
+
+async def apply_complaint_updates(batch: dict):
+    """
+    Flush of the write queue: batch is {complaint_id: fields to $set}.
+    Reads the current documents in one query (migrating legacy owners of
+    the ones not found), writes every update concurrently and reports
+    the changes to complaints_changed. Returns
+    {complaint_id: True | False (not found) | HTTPException}.
+
+    Each write is a compare-and-set on the status / assigned_to just
+    read, so the reported "before" is the document the write replaced,
+    even with several processes flushing. A complaint changed in between
+    is read again and retried on top of that change; after
+    MAX_UPDATE_ATTEMPTS it gets a 409.
+    """
+    complaint_ids = list(batch)
+    befores = await _find_change_fields(complaint_ids)
+
+    missing = [cid for cid in complaint_ids if cid not in befores]
+    if missing and complaint_legacy_reads:
+        migrated = await asyncio.gather(*(migrate_owner_of(cid) for cid in missing))
+        retry = [cid for cid, done in zip(missing, migrated) if done]
+        if retry:
+            befores.update(await _find_change_fields(retry))
+
+    results = {cid: False for cid in complaint_ids}
+    changes = []
+    pending = [cid for cid in complaint_ids if cid in befores]
+
+    for attempt in range(MAX_UPDATE_ATTEMPTS):
+        if not pending:
+            break
+        if attempt:
+            # Another writer got there first: read again, reapply on top
+            fresh = await _find_change_fields(pending)
+            befores.update(fresh)
+            pending = [cid for cid in pending if cid in fresh]
+
+        now = datetime.utcnow()
+        outcomes = await asyncio.gather(
+            *(_compare_and_set(cid, befores[cid], batch[cid], now) for cid in pending),
+            return_exceptions=True,
+        )
+
+        lost = []
+        for cid, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                results[cid] = HTTPException(status_code=500, detail=str(outcome))
+            elif outcome:
+                results[cid] = True
+                changes.append((befores[cid], _after_update(befores[cid], batch[cid], now)))
+            else:
+                lost.append(cid)
+        pending = lost
+
+    for cid in pending:
+        results[cid] = HTTPException(status_code=409, detail="Complaint changed concurrently, try again")
+
+    await complaints_changed(changes)
+    return results
+
+
+# Status / assignee updates are coalesced per complaint and flushed together
+complaint_write_queue = WriteQueue(
+    "complaint_updates",
+    apply_complaint_updates,
+    max_batch=write_queue_max_batch,
+    max_delay=write_queue_max_delay_ms / 1000,
+)
+register_collector("complaint_write_queue", complaint_write_queue.metric_lines)
+
+
+async def update_complaint_fields(complaint_id: str, status: str | None = None, assigned_to: str | None = None):
+    """
+    $set status / assigned_to of a single complaint through the write
+    queue; resolves once its batch is written. Returns False when the
+    complaint does not exist; an unknown status is a 400.
+    """
+    fields = {}
+    if status is not None:
+        fields["status"] = parse_status(status)
+    if assigned_to is not None:
+        fields["assigned_to"] = assigned_to
+
+    if fields:
+        return await complaint_write_queue.submit(complaint_id, fields)
+
+    found = await complaint_items_col().find_one({"_id": complaint_id}, {"_id": 1}) is not None
+    if not found and complaint_legacy_reads:
+        found = await migrate_owner_of(complaint_id)
+    return found
+
+
+# -----------------------------------
+# Get Complaint Status
+# -----------------------------------
+STATUS_FIELDS = {"_id": 0, "status": 1, "complaint_details": 1, "assigned_to": 1, "created_at": 1}
+
+
+async def _find_status_fields(mobile_number: str, complaint_id: str):
+    """
+    One round trip, projected to the four fields a status check returns.
+    While legacy reads are on, the same aggregation also looks at
+    complaints.<complaint_id> of an un-migrated customer, projected to that
+    single entry – never the rest of the history.
+    """
+    item_filter = {"_id": complaint_id, "mobile_number": mobile_number}
+
+    if not complaint_legacy_reads:
+        return await complaint_items_col().find_one(item_filter, STATUS_FIELDS)
+
+    entry = f"${complaint_path(complaint_id)}"
+    pipeline = [
+        {"$match": item_filter},
+        {"$project": STATUS_FIELDS},
+        {
+            "$unionWith": {
+                "coll": complaints_col().name,
+                "pipeline": [
+                    {"$match": {"mobile_number": mobile_number, "migrated_at": None}},
+                    {"$project": {"_id": 0, "entry": entry}},
+                    {"$match": {"entry": {"$type": "object"}}},
+                    {
+                        "$project": {
+                            "status": status_label_expr("$entry.status"),
+                            "complaint_details": "$entry.complaint_details",
+                            "assigned_to": "$entry.assigned_to",
+                            "created_at": "$entry.created_at",
+                        }
+                    },
+                ],
+            }
+        },
+        {"$limit": 1},
+    ]
+    rows = await complaint_items_col().aggregate(pipeline).to_list(1)
+    return rows[0] if rows else None
+
+
+def _status_result(complaint_id: str, item):
+    return {
+        "complaint_id": complaint_id,
+        "status": item.get("status", "Pending"),
+        "details": item.get("complaint_details"),
+        "assigned_to": item.get("assigned_to"),
+        "created_at": item.get("created_at"),
+    }
+
+
+async def get_complaint_status(mobile_number: str, complaint_id: str):
+    key = ("status", mobile_number, complaint_id)
+    cached = complaint_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    version = customer_version(mobile_number)
+    item = await _find_status_fields(mobile_number, complaint_id)
+
+    if not item:
+        # Only the miss path pays for telling the two 404s apart
+        if not await check_user_exists(mobile_number):
+            raise HTTPException(status_code=404, detail="User not found")
+        raise HTTPException(status_code=404, detail="Complaint not found")
+
+    result = _status_result(complaint_id, item)
+    if customer_version(mobile_number) == version:
+        complaint_cache.set(key, result)
+    return result
+
+
+# -----------------------------------
+# Get status of many complaints at once
+# -----------------------------------
+async def get_complaint_statuses(pairs):
+    """
+    pairs: list of (mobile_number, complaint_id).
+    Cache first, then one $in query on complaint_items for the rest and –
+    while legacy reads are on – one more for whatever is still missing.
+    Returns one dict per pair, in order, with either the status fields or
+    an "error".
+    """
+    found = {}
+    wanted = []
+    for mobile_number, complaint_id in pairs:
+        cached = complaint_cache.get(("status", mobile_number, complaint_id))
+        if cached is not MISSING:
+            found[(mobile_number, complaint_id)] = cached
+        else:
+            wanted.append((mobile_number, complaint_id))
+
+    versions = {mobile_number: customer_version(mobile_number) for mobile_number, _ in wanted}
+
+    def remember(key, result):
+        found[key] = result
+        if customer_version(key[0]) == versions[key[0]]:
+            complaint_cache.set(("status", *key), result)
+
+    if wanted:
+        items = complaint_items_col().find(
+            {"_id": {"$in": list({cid for _, cid in wanted})}},
+            {**STATUS_FIELDS, "_id": 1, "mobile_number": 1},
+        )
+        async for item in items:
+            key = (item["mobile_number"], item["_id"])
+            if key[0] in versions:
+                remember(key, _status_result(item["_id"], item))
+
+    missing = [pair for pair in wanted if pair not in found]
+    if missing and complaint_legacy_reads:
+        projection = {"mobile_number": 1}
+        for _, complaint_id in missing:
+            try:
+                projection[complaint_path(complaint_id)] = 1
+            except HTTPException:
+                continue
+
+        customers = complaints_col().find(
+            {"mobile_number": {"$in": list({m for m, _ in missing})}, "migrated_at": None},
+            projection,
+        )
+        async for customer in customers:
+            for complaint_id, entry in (customer.get("complaints") or {}).items():
+                key = (customer["mobile_number"], complaint_id)
+                if key in missing:
+                    remember(key, _status_result(complaint_id, legacy_entry_to_item(customer, entry)))
+
+    results = []
+    for mobile_number, complaint_id in pairs:
+        result = found.get((mobile_number, complaint_id))
+        if result:
+            results.append({"mobile_number": mobile_number, **result})
+        else:
+            results.append({
+                "mobile_number": mobile_number,
+                "complaint_id": complaint_id,
+                "error": "Complaint not found",
+            })
+    return results
+
+
+# -----------------------------------
+# User – complaints of one customer
+# -----------------------------------
+async def list_customer_complaints(mobile_number: str):
+    """
+    (version, rows) for one customer, rows oldest first. version is the
+    list version the rows are current for – build the ETag from it.
+    """
+    key = ("customer", mobile_number)
+    version = customer_version(mobile_number)
+    cached = complaint_cache.get(key)
+    if cached is not MISSING and cached[0] == version:
+        return cached
+
+    pipeline = rows_pipeline(
+        item_filter={"mobile_number": mobile_number},
+        legacy_customer_filter={"mobile_number": mobile_number},
+        sort=1,
+    )
+    rows = await complaint_items_col().aggregate(pipeline).to_list(None)
+    if customer_version(mobile_number) == version:
+        complaint_cache.set(key, (version, rows))
+    return version, rows
+
+
+# -----------------------------------
+# Admin – paginated complaint listing
+# -----------------------------------
+async def list_complaints_page(
+    limit: int | None,
+    cursor: str | None = None,
+    status: str | None = None,
+    assigned_to: str | None = None,
+    descending: bool = True,
+):
+    """
+    Returns (rows, next_cursor). Filtering, sorting and the page cut all
+    happen in MongoDB; only limit + 1 rows come back.
+    """
+    after = decode_cursor(cursor) if cursor else None
+
+    pipeline = rows_pipeline(
+        item_filter=_row_filters(status, assigned_to, after, descending, "_id"),
+        # assignees is indexed – only unwind customers that can match
+        legacy_customer_filter={"assignees": assigned_to} if assigned_to else None,
+        legacy_row_filter=_row_filters(status, assigned_to, after, descending, "complaint_id"),
+        sort=-1 if descending else 1,
+        limit=limit + 1 if limit else None,
+    )
+
+    rows = await complaint_items_col().aggregate(pipeline).to_list(None)
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return rows, next_cursor
+
+
+# -----------------------------------
+# Employee – assigned tasks
+# -----------------------------------
+async def list_employee_tasks(
+    email: str,
+    status: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """
+    Complaints assigned to email, newest first, served from the
+    (assigned_to, created_at) index. Returns (rows, next_cursor).
+    """
+    return await list_complaints_page(
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        assigned_to=email,
+    )
+
+
+# -----------------------------------
+# Admin – stream every complaint row
+# -----------------------------------
+async def iter_complaint_rows(
+    status: str | None = None,
+    assigned_to: str | None = None,
+    batch_size: int = 500,
+):
+    """
+    Async generator over listing rows, fetched batch_size at a time from a
+    Motor cursor. Unsorted on purpose: a global sort would make the server
+    buffer everything before the first row.
+    """
+    filters = _row_filters(status, assigned_to, None, True, "_id")
+
+    pipeline = rows_pipeline(
+        item_filter=filters,
+        legacy_customer_filter={"assignees": assigned_to} if assigned_to else None,
+        legacy_row_filter=filters,
+    )
+
+    cursor = complaint_items_col().aggregate(pipeline, batchSize=batch_size)
+    async for row in cursor:
+        yield row
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import time
+
+from pymongo import UpdateOne
+
+from backend.mongodb_service.app.mongodb.db_connections import (
+    init_db,
+    close_db,
+    get_db,
+    complaint_items_col,
+)
+
+
+# ===================================================================
+# Dashboard counters – complaints per (status, assigned_to)
+#
+# One small document per status/assignee pair, kept current with $inc
+# by the repository's write paths, so the dashboard summary reads a
+# handful of documents instead of scanning complaints:
+#
+#   {"_id": "Pending|a@x.com", "status": "Pending", "assigned_to": "a@x.com", "count": 12}
+#
+# The increments are separate writes from the complaint update itself,
+# so a crash in between can leave a counter off by one. Rebuilding
+# recomputes everything from the complaints with one aggregation:
+#
+#   python -m backend.mongodb_service.app.mongodb.dashboard_counters
+# ===================================================================
+COUNTERS_COLLECTION = "complaint_counters"
+
+
+def counters_col():
+    return get_db()[COUNTERS_COLLECTION]
+
+
+def counter_key(status: str, assigned_to: str | None) -> str:
+    return f"{status}|{assigned_to or ''}"
+
+
+def counter_deltas(changes):
+    """
+    Net increments for a batch of complaint changes. Each change is a
+    (before, after) pair of dicts with status / assigned_to, None for
+    "did not exist". Returns {(status, assigned_to): delta}.
+    """
+    deltas = {}
+    for before, after in changes:
+        for doc, amount in ((before, -1), (after, 1)):
+            if doc:
+                key = (doc["status"], doc.get("assigned_to"))
+                deltas[key] = deltas.get(key, 0) + amount
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+async def apply_counter_deltas(deltas):
+    ops = [
+        UpdateOne(
+            {"_id": counter_key(status, assigned_to)},
+            {
+                "$inc": {"count": delta},
+                "$setOnInsert": {"status": status, "assigned_to": assigned_to},
+            },
+            upsert=True,
+        )
+        for (status, assigned_to), delta in deltas.items()
+    ]
+    if ops:
+        await counters_col().bulk_write(ops, ordered=False)
+
+
+# -----------------------------------
+# Dashboard summary
+# -----------------------------------
+async def dashboard_summary():
+    """
+    Totals by status and per-assignee workload, from the counter
+    documents only.
+    """
+    counters = await counters_col().find({"count": {"$gt": 0}}, {"_id": 0}).to_list(None)
+
+    by_status = {}
+    by_assignee = {}
+    for counter in counters:
+        status, count = counter["status"], counter["count"]
+        by_status[status] = by_status.get(status, 0) + count
+
+        assignee = counter.get("assigned_to")
+        if assignee:
+            workload = by_assignee.setdefault(assignee, {"total": 0})
+            workload[status] = workload.get(status, 0) + count
+            workload["total"] += count
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "unassigned": sum(c["count"] for c in counters if not c.get("assigned_to")),
+        "by_assignee": by_assignee,
+    }
+
+
+# -----------------------------------
+# Rebuild from scratch
+# -----------------------------------
+async def rebuild_counters():
+    """
+    Group every complaint (legacy entries included while legacy reads are
+    on) by status and assignee and replace the counters collection with
+    the result ($out swaps it in atomically). Increments made while the
+    aggregation runs are lost with the old collection, so run it when
+    writes are quiet. Returns the number of counter documents written.
+    """
+    # Imported here: the repository imports this module for its write hooks
+    from backend.mongodb_service.app.mongodb.complaint_repository import rows_pipeline
+
+    pipeline = rows_pipeline({}) + [
+        {"$group": {"_id": {"status": "$status", "assigned_to": "$assigned_to"}, "count": {"$sum": 1}}},
+        {
+            "$project": {
+                "_id": {"$concat": ["$_id.status", "|", {"$ifNull": ["$_id.assigned_to", ""]}]},
+                "status": "$_id.status",
+                "assigned_to": "$_id.assigned_to",
+                "count": 1,
+            }
+        },
+        {"$out": COUNTERS_COLLECTION},
+    ]
+    await complaint_items_col().aggregate(pipeline).to_list(None)
+    return await counters_col().count_documents({})
+
+
+async def _run_cli():
+    await init_db()
+    try:
+        started = time.perf_counter()
+        written = await rebuild_counters()
+        print(f"🧮 Rebuilt {written} dashboard counters in {time.perf_counter() - started:.1f}s")
+    finally:
+        await close_db()
+
+
+def main():
+    argparse.ArgumentParser(description="Recompute the dashboard counters from the complaints").parse_args()
+    asyncio.run(_run_cli())
+
+
+if __name__ == "__main__":
+    main()
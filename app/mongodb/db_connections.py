@@ -1,137 +1,171 @@
-from datetime import datetime
+import asyncio
+
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from backend.mongodb_service.app.core.config import (
     mongodb_uri,
-    mongodb_database
+    mongodb_database,
+    db_startup_maintenance,
 )
 
-from backend.mongodb_service.app.models.db_schemas import Complaint
-from backend.mongodb_service.app.models.users_model import UserInDB
+from backend.mongodb_service.app.core.metrics import command_metrics
+from backend.mongodb_service.app.core.slow_queries import slow_query_recorder
+from backend.mongodb_service.app.mongodb.write_queue import drain_write_queues
+from backend.mongodb_service.app.mongodb.duplicates import check_unique_keys
+from backend.mongodb_service.app.models.db_schemas import Complaint, ComplaintItem
+from backend.mongodb_service.app.models.users_model import User, UserInDB
 
-import uuid
-from bson import ObjectId
-from fastapi import HTTPException
+from pymongo import ASCENDING, IndexModel
 
 
 # -----------------------------------
 # MongoDB Client Setup
 # -----------------------------------
-client = AsyncIOMotorClient(mongodb_uri)
-db = client[mongodb_database]
+# The client is built on first use (normally init_db in the app lifespan),
+# not at import, and dropped again by close_db. Code that needs a
+# collection asks for it at call time through the accessors below.
+_client: AsyncIOMotorClient | None = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        # command_metrics attributes every command to the HTTP request that
+        # issued it, slow_query_recorder keeps the ones over SLOW_QUERY_THRESHOLD_MS
+        _client = AsyncIOMotorClient(
+            mongodb_uri,
+            event_listeners=[command_metrics, slow_query_recorder],
+        )
+    return _client
+
+
+def get_db():
+    return get_client()[mongodb_database]
+
+
+# Raw collection handles
+def complaints_col():
+    """customers (+ legacy nested complaints)"""
+    return get_db()["complaints"]
+
 
-# Employees collection (for employee login)
-employees_col = db["employees"]
+def complaint_items_col():
+    """one document per complaint"""
+    return get_db()["complaint_items"]
+
+
+def employees_col():
+    """employees (for employee login)"""
+    return get_db()["employees"]
+
+
+# Indexes for collections that are not Beanie documents
+EMPLOYEE_INDEXES = [
+    IndexModel([("email", ASCENDING)], unique=True),
+]
 
 
 # -----------------------------------
 # Initialize Beanie ODM
 # -----------------------------------
 async def init_db():
+    db = get_db()
+    print("💾 Mongo URI =", mongodb_uri)
+    print("💾 Mongo DB =", mongodb_database)
+    slow_query_recorder.bind(db)
+
+    # init_beanie also builds the indexes declared in each Settings.indexes.
+    # With DB_STARTUP_MAINTENANCE=0 (extra replicas) index builds, the
+    # backfill and the index report are left to the instance that runs them.
+    if db_startup_maintenance:
+        # Unique indexes can't be built over duplicates – stop with a list
+        await check_unique_keys(db)
+
     await init_beanie(
         database=db,
-        document_models=[Complaint, UserInDB]
+        document_models=[Complaint, ComplaintItem, UserInDB, User],
+        skip_indexes=not db_startup_maintenance,
     )
+    if db_startup_maintenance:
+        await employees_col().create_indexes(EMPLOYEE_INDEXES)
+        await backfill_lookup_fields()
+        await seed_dashboard_counters()
+        await ensure_analytics_indexes()
+        await report_indexes()
 
 
 # -----------------------------------
-# Close DB
-# -----------------------------------
-async def close_db():
-    client.close()
-
-
-# -----------------------------------
-# Insert Complaint (New User)
+# Backfill complaint_ids / assignees
 # -----------------------------------
-async def insert_in_db(data):
-    complaint_id = str(uuid.uuid4())
-
-    # 💡 FIX 1: Always generate datetime
-    created_time = datetime.utcnow()
-
-    complaint = Complaint(
-        name=data.name,
-        mobile_number=data.mobile_number,
-        complaints={
-            complaint_id: {
-                "complaint_details": data.complaints.complaint_details,
-                "status": "Pending",
-                "assigned_to": None,
-                "created_at": created_time,     # FIXED (never None)
+async def backfill_lookup_fields():
+    """
+    Populate complaint_ids and assignees on documents written before the
+    fields existed. Runs server-side in one update, so startup never pulls
+    the documents.
+    """
+    entries = {"$objectToArray": {"$ifNull": ["$complaints", {}]}}
+
+    await complaints_col().update_many(
+        {
+            "$or": [
+                {"complaint_ids": {"$exists": False}},
+                {"assignees": {"$exists": False}},
+            ]
+        },
+        [
+            {
+                "$set": {
+                    "complaint_ids": {"$map": {"input": entries, "in": "$$this.k"}},
+                    "assignees": {
+                        "$setDifference": [
+                            {"$setUnion": [{"$map": {"input": entries, "in": "$$this.v.assigned_to"}}]},
+                            [None],
+                        ]
+                    },
+                }
             }
-        }
+        ],
     )
 
-    await complaint.insert()
-
-    return {
-        "message": "Success",
-        "complaint_id": complaint_id
-    }
-
 
 # -----------------------------------
-# Check if user exists
+# Dashboard counters on first start
 # -----------------------------------
-async def check_user_exists(mobile_number: str):
-    if not mobile_number:
-        raise HTTPException(status_code=400, detail="Mobile number missing")
+async def seed_dashboard_counters():
+    """Build the dashboard counters once if they were never built."""
+    from backend.mongodb_service.app.mongodb.dashboard_counters import counters_col, rebuild_counters
 
-    user = await Complaint.find_one({"mobile_number": mobile_number})
-    return str(user.id) if user else False
+    if not await counters_col().estimated_document_count():
+        await rebuild_counters()
 
 
 # -----------------------------------
-# Add Complaint (Existing User)
+# Analytics rollup indexes
 # -----------------------------------
-async def add_complaint_to_user(mongo_id: str, new_complaint):
-    obj_id = ObjectId(mongo_id)
-    complaint_doc = await Complaint.get(obj_id)
-
-    if not complaint_doc:
-        raise HTTPException(status_code=404, detail="User complaint document not found")
-
-    complaint_id = str(uuid.uuid4())
-
-    # 💡 FIX 2: Always generate datetime
-    created_time = datetime.utcnow()
+async def ensure_analytics_indexes():
+    from backend.mongodb_service.app.mongodb.analytics import ensure_indexes
 
-    complaint_doc.complaints[complaint_id] = {
-        "complaint_details": new_complaint.complaints.complaint_details,
-        "status": "Pending",
-        "assigned_to": None,
-        "created_at": created_time,     # FIXED (never None)
-    }
-
-    await complaint_doc.save()
-
-    return {
-        "message": "New complaint added",
-        "complaint_id": complaint_id
-    }
+    await ensure_indexes()
 
 
 # -----------------------------------
-# Get Complaint Status
+# Report indexes on startup
 # -----------------------------------
-async def get_complaint_status(obj_id: str, complaint_id: str):
-    mongo_obj_id = ObjectId(obj_id)
-    user = await Complaint.get(mongo_obj_id)
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    complaint = user.complaints.get(complaint_id)
+async def report_indexes():
+    names = ("complaints", "complaint_items", "users", "employees")
+    infos = await asyncio.gather(*(get_db()[name].index_information() for name in names))
+    for name, info in zip(names, infos):
+        print(f"🗂️ Indexes on {name}: {', '.join(sorted(info))}")
 
-    if not complaint:
-        raise HTTPException(status_code=404, detail="Complaint not found")
 
-    return {
-        "complaint_id": complaint_id,
-        "status": complaint.get("status", "Pending"),
-        "details": complaint.get("complaint_details"),
-        "assigned_to": complaint.get("assigned_to"),
-        "created_at": complaint.get("created_at"),
-    }
+# -----------------------------------
+# Close DB
+# -----------------------------------
+async def close_db():
+    global _client
+    # Queued status / assignee updates go out before the client closes
+    await drain_write_queues()
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+
+
+# ===================================================================
+# Duplicate check for the unique indexes built in init_db
+#
+# Data written by the old check-then-insert code can hold duplicates
+# (two customers with one mobile_number, two users or employees
+# registered concurrently with one email). Building the unique index on
+# such data fails with a raw E11000 OperationFailure, so init_db runs
+# check_unique_keys() first and stops with a readable list instead.
+# The same list, before a deploy:
+#
+#   python -m backend.mongodb_service.app.mongodb.duplicates
+#
+# Merge or delete the duplicates, then start the service.
+# ===================================================================
+
+# (collection, field) pairs that get a unique index
+UNIQUE_KEYS = [
+    ("complaints", "mobile_number"),
+    ("users", "email"),         # User / UserInDB
+    ("employees", "email"),     # EMPLOYEE_INDEXES
+]
+
+SHOW_PER_KEY = 20
+
+
+class DuplicateKeysError(RuntimeError):
+    pass
+
+
+def _has_unique_index(index_information: dict, field: str) -> bool:
+    return any(
+        info.get("unique") and [key for key, _ in info["key"]] == [field]
+        for info in index_information.values()
+    )
+
+
+async def find_duplicates(collection, field: str, limit: int = SHOW_PER_KEY):
+    """
+    Values of field held by more than one document, with their _ids.
+    A unique index treats a missing field as null, so documents without
+    it group together (under None) like any other value.
+    """
+    pipeline = [
+        {"$group": {"_id": {"$ifNull": [f"${field}", None]}, "count": {"$sum": 1}, "ids": {"$push": "$_id"}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": limit},
+    ]
+    return await collection.aggregate(pipeline, allowDiskUse=True).to_list(None)
+
+
+async def duplicate_report(db):
+    """{(collection, field): [duplicates]} for keys not yet protected by a unique index."""
+    report = {}
+    for name, field in UNIQUE_KEYS:
+        collection = db[name]
+        if _has_unique_index(await collection.index_information(), field):
+            continue    # the index exists, so there can't be any
+        duplicates = await find_duplicates(collection, field)
+        if duplicates:
+            report[(name, field)] = duplicates
+    return report
+
+
+def format_report(report) -> str:
+    lines = []
+    for (name, field), duplicates in report.items():
+        lines.append(f"{name}.{field}: {len(duplicates)} duplicated value(s) (first {SHOW_PER_KEY} shown)")
+        for dup in duplicates:
+            ids = ", ".join(str(i) for i in dup["ids"])
+            lines.append(f"   {dup['_id']!r} x{dup['count']}: {ids}")
+    return "\n".join(lines)
+
+
+async def check_unique_keys(db):
+    """Raise DuplicateKeysError before a unique index build would fail."""
+    report = await duplicate_report(db)
+    if report:
+        raise DuplicateKeysError(
+            "Cannot build unique indexes, duplicates found – merge or delete them "
+            "and restart (list them with `python -m "
+            "backend.mongodb_service.app.mongodb.duplicates`):\n" + format_report(report)
+        )
+
+
+async def _run_cli():
+    from backend.mongodb_service.app.mongodb.db_connections import get_db, close_db
+
+    try:
+        report = await duplicate_report(get_db())
+    finally:
+        await close_db()
+
+    if not report:
+        print("✅ No duplicates on unique keys")
+        return 0
+    print(format_report(report))
+    return 1
+
+
+def main():
+    argparse.ArgumentParser(description="List duplicates that block the unique indexes").parse_args()
+    raise SystemExit(asyncio.run(_run_cli()))
+
+
+if __name__ == "__main__":
+    main()
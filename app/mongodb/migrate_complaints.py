@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import time
+
+from backend.mongodb_service.app.mongodb.db_connections import (
+    init_db,
+    close_db,
+    complaints_col,
+)
+from backend.mongodb_service.app.mongodb.complaint_repository import migrate_customers
+
+
+# ===================================================================
+# Online migration: nested Complaint.complaints -> complaint_items
+#
+#   python -m backend.mongodb_service.app.mongodb.migrate_complaints
+#
+# Safe to run against a live service (it serves un-migrated customers
+# through the legacy read path meanwhile) and safe to stop at any point:
+# customers are marked migrated_at batch by batch, so a re-run resumes
+# where the last one stopped. Once it reports 0 remaining, deploy with
+# COMPLAINT_LEGACY_READS=0.
+# ===================================================================
+
+
+async def migrate(batch_size: int, pause: float, max_batches: int | None):
+    await init_db()
+
+    query = {"migrated_at": None}
+    projection = {"name": 1, "mobile_number": 1, "complaints": 1}
+
+    remaining = await complaints_col().count_documents(query)
+    print(f"🚚 {remaining} customers to migrate")
+
+    last_id = None
+    batches = customers = complaints = 0
+    started = time.perf_counter()
+
+    while max_batches is None or batches < max_batches:
+        # Walk _id order within this run so a customer that keeps failing
+        # can't stall the loop; it is retried on the next run.
+        page_query = dict(query)
+        if last_id is not None:
+            page_query["_id"] = {"$gt": last_id}
+
+        batch = await (
+            complaints_col().find(page_query, projection)
+            .sort("_id", 1)
+            .limit(batch_size)
+            .to_list(None)
+        )
+        if not batch:
+            break
+
+        last_id = batch[-1]["_id"]
+        try:
+            complaints += await migrate_customers(batch)
+            customers += len(batch)
+        except Exception as exc:
+            print(f"⚠️ Batch ending at {last_id} failed, will be retried next run: {exc}")
+
+        batches += 1
+        print(f"   batch {batches}: {customers} customers / {complaints} complaints")
+
+        if pause:
+            await asyncio.sleep(pause)
+
+    remaining = await complaints_col().count_documents(query)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Migrated {customers} customers ({complaints} complaints) in {elapsed:.1f}s, {remaining} remaining")
+
+    await close_db()
+    return remaining
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move nested complaints to one document per complaint")
+    parser.add_argument("--batch-size", type=int, default=500, help="customers per batch")
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after this many batches")
+    args = parser.parse_args()
+
+    remaining = asyncio.run(migrate(args.batch_size, args.pause, args.max_batches))
+    raise SystemExit(1 if remaining else 0)
+
+
+if __name__ == "__main__":
+    main()
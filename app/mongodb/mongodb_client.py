@@ -1,5 +1,16 @@
-from backend.mongodb_service.app.mongodb.db_connections import db
+from backend.mongodb_service.app.mongodb.db_connections import get_db
 
-# Motor-style collection handles used by chat_service.auth.routes
-complaints_collection = db["complaints"]
-users_collection = db["users"]
+# Motor-style collection handles used by chat_service.auth.routes.
+# Resolved on attribute access so importing this module does not build
+# the Mongo client.
+_COLLECTIONS = {
+    "complaints_collection": "complaints",
+    "users_collection": "users",
+    "complaint_items_collection": "complaint_items",
+}
+
+
+def __getattr__(name):
+    if name in _COLLECTIONS:
+        return get_db()[_COLLECTIONS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,112 @@
+import asyncio
+
+# ===================================================================
+# Write-coalescing queue
+#
+# submit(key, fields) parks a change and returns a future. Changes to
+# the same key merge (later fields win) until the batch is flushed –
+# when max_batch distinct keys are pending or max_delay seconds after
+# the first one, whichever comes first. flush(batch) gets
+# {key: merged fields} and returns {key: result or Exception}; every
+# future of that key gets the outcome.
+#
+# Flushes run one at a time, so changes to a key reach the database in
+# submission order. close_db() drains every queue before the client
+# goes away.
+# ===================================================================
+_queues = []
+
+
+class WriteQueue:
+    def __init__(self, name: str, flush, max_batch: int, max_delay: float):
+        self.name = name
+        self.flush = flush
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max(max_delay, 0.0)
+
+        self._pending = {}          # key -> (fields, [futures])
+        self._timer = None
+        self._flushing = set()
+        self._lock = asyncio.Lock()
+
+        self.submitted = 0
+        self.merged = 0
+        self.flushes = 0
+        self.flushed_keys = 0
+        _queues.append(self)
+
+    def submit(self, key, fields: dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submitted += 1
+
+        entry = self._pending.get(key)
+        if entry:
+            entry[0].update(fields)
+            entry[1].append(future)
+            self.merged += 1
+        else:
+            self._pending[key] = (dict(fields), [future])
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return future
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _flush(self, batch):
+        async with self._lock:
+            self.flushes += 1
+            self.flushed_keys += len(batch)
+            try:
+                results = await self.flush({key: fields for key, (fields, _) in batch.items()})
+            except Exception as exc:
+                results = {key: exc for key in batch}
+
+        for key, (_, futures) in batch.items():
+            result = results.get(key)
+            for future in futures:
+                if future.done():       # caller gave up (e.g. disconnected)
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def drain(self):
+        """Flush what is pending now and wait for every flush in flight."""
+        self._start_flush()
+        while self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def metric_lines(self):
+        label = f'queue="{self.name}"'
+        return [
+            "# TYPE write_queue_submitted_total counter",
+            f"write_queue_submitted_total{{{label}}} {self.submitted}",
+            "# TYPE write_queue_merged_total counter",
+            f"write_queue_merged_total{{{label}}} {self.merged}",
+            "# TYPE write_queue_flushes_total counter",
+            f"write_queue_flushes_total{{{label}}} {self.flushes}",
+            "# TYPE write_queue_flushed_keys_total counter",
+            f"write_queue_flushed_keys_total{{{label}}} {self.flushed_keys}",
+            "# TYPE write_queue_pending gauge",
+            f"write_queue_pending{{{label}}} {len(self._pending)}",
+        ]
+
+
+async def drain_write_queues():
+    for queue in _queues:
+        await queue.drain()
@@ -0,0 +1,446 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# ===================================================================
+# Benchmark / load-test harness
+#
+# Seeds a dedicated database on a local mongod with synthetic customers,
+# complaints and employees, then drives the routes through the ASGI app
+# in-process (httpx.ASGITransport – no network, no uvicorn) and reports
+# throughput and p50/p95/p99 latency per route as JSON.
+#
+#   # one run
+#   python -m backend.mongodb_service.benchmarks.bench run --customers 5000 --out bench.json
+#   # compare against a saved run (exit 1 on p95 regressions)
+#   python -m backend.mongodb_service.benchmarks.bench run --baseline bench.json
+#   # scaling curve: latency vs collection size
+#   python -m backend.mongodb_service.benchmarks.bench scale --sizes 1000,10000,100000
+#   # response encoding only, synthetic rows, no mongod
+#   python -m backend.mongodb_service.benchmarks.bench serialize --rows 100,500,5000
+#
+# The database name must contain "bench"; it is dropped before seeding.
+#
+# The scenarios repeat the same requests, so the read cache and the
+# single-flight reuse window would answer most of them from memory and
+# hide how the queries scale. Both are off unless set explicitly – e.g.
+# SINGLE_FLIGHT_REUSE_SECONDS=1 COMPLAINT_CACHE_TTL_SECONDS=5 for a
+# warm run.
+# ===================================================================
+os.environ.setdefault("MONGODB_DATABASE_NAME_TEST", "helpdesk_bench")
+os.environ.setdefault("SINGLE_FLIGHT_REUSE_SECONDS", "0")
+os.environ.setdefault("COMPLAINT_CACHE_TTL_SECONDS", "0")
+
+STATUSES = ["Pending", "In Progress", "Resolved", "Closed"]
+PASSWORD = "bench-password"
+
+
+# -----------------------------------
+# Synthetic data
+# -----------------------------------
+class Dataset:
+    def __init__(self):
+        self.mobiles = []
+        self.complaint_ids = []          # (mobile, complaint_id)
+        self.employees = []
+        self.users = []
+
+
+async def seed(db, customers: int, per_customer: int, employees: int, users: int, layout: str, seed_value: int):
+    """
+    Bulk-loads the bench database. layout="items" writes complaint_items
+    (current layout); layout="legacy" writes the nested pre-migration
+    layout so the dual-read path can be measured too.
+    """
+    from backend.mongodb_service.app.core.passwords import hash_password
+
+    rng = random.Random(seed_value)
+    data = Dataset()
+    await db.client.drop_database(db.name)
+
+    hashed = await hash_password(PASSWORD)
+    data.employees = [f"employee{i}@bench.local" for i in range(employees)]
+    data.users = [f"user{i}@bench.local" for i in range(users)]
+
+    if data.employees:
+        await db["employees"].insert_many(
+            [{"name": f"Employee {i}", "email": email, "password": hashed, "assigned_tasks": []}
+             for i, email in enumerate(data.employees)]
+        )
+    if data.users:
+        await db["users"].insert_many(
+            [{"name": f"User {i}", "email": email, "password": hashed, "role": "user"}
+             for i, email in enumerate(data.users)]
+        )
+
+    now = datetime.utcnow()
+    chunk = 1000
+    for start in range(0, customers, chunk):
+        customer_docs, item_docs = [], []
+
+        for n in range(start, min(start + chunk, customers)):
+            mobile = f"9{n:09d}"
+            data.mobiles.append(mobile)
+            nested = {}
+
+            for _ in range(per_customer):
+                cid = str(uuid.uuid4())
+                data.complaint_ids.append((mobile, cid))
+                entry = {
+                    "complaint_details": f"Synthetic complaint {cid[:8]}",
+                    "status": rng.choice(STATUSES),
+                    "assigned_to": rng.choice(data.employees) if data.employees and rng.random() < 0.7 else None,
+                    "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+                }
+                if layout == "legacy":
+                    nested[cid] = entry
+                else:
+                    item_docs.append({"_id": cid, "mobile_number": mobile, "name": f"Customer {n}", **entry})
+
+            customer_docs.append({
+                "name": f"Customer {n}",
+                "mobile_number": mobile,
+                "complaints": nested,
+                "complaint_ids": list(nested),
+                "assignees": sorted({e["assigned_to"] for e in nested.values() if e["assigned_to"]}),
+                **({} if layout == "legacy" else {"migrated_at": now}),
+            })
+
+        await db["complaints"].insert_many(customer_docs, ordered=False)
+        if item_docs:
+            await db["complaint_items"].insert_many(item_docs, ordered=False)
+
+    return data
+
+
+# -----------------------------------
+# Scenarios: name -> (weight, request factory)
+# weight scales the per-scenario request count (bcrypt routes are slow
+# by design, full exports are big).
+# -----------------------------------
+def scenarios(data: Dataset, rng: random.Random):
+    def any_complaint():
+        return rng.choice(data.complaint_ids)
+
+    def register():
+        mobile = rng.choice(data.mobiles) if rng.random() < 0.8 else f"8{rng.randint(0, 10**9 - 1):09d}"
+        return "POST", "/register-complaint-mongodb/", {
+            "name": "Bench Customer",
+            "mobile_number": mobile,
+            "complaints": {"complaint_details": "Benchmark complaint"},
+        }
+
+    def status():
+        mobile, cid = any_complaint()
+        return "POST", "/check-complaint-status-mongodb/", {"mobile_number": mobile, "complaint_id": cid}
+
+    def status_batch():
+        items = [{"mobile_number": m, "complaint_id": c} for m, c in rng.sample(data.complaint_ids, min(20, len(data.complaint_ids)))]
+        return "POST", "/check-complaint-status-batch/", {"items": items}
+
+    def user_complaints():
+        return "POST", "/user/complaints", {"mobile": rng.choice(data.mobiles)}
+
+    def admin_list():
+        return "GET", "/admin/complaints?limit=100", None
+
+    def admin_list_filtered():
+        return "GET", f"/admin/complaints?limit=100&status={rng.choice(STATUSES)}", None
+
+    def admin_summary():
+        return "GET", "/admin/complaints/summary", None
+
+    def admin_export():
+        return "GET", "/admin/complaints/export?format=ndjson", None
+
+    def admin_update():
+        _, cid = any_complaint()
+        return "POST", "/admin/complaints/update", {
+            "complaint_id": cid,
+            "status": rng.choice(STATUSES),
+            "assigned_to": rng.choice(data.employees) if data.employees else None,
+        }
+
+    def admin_update_batch():
+        items = [
+            {"complaint_id": cid, "status": rng.choice(STATUSES)}
+            for _, cid in rng.sample(data.complaint_ids, min(50, len(data.complaint_ids)))
+        ]
+        return "POST", "/admin/complaints/update-batch", {"items": items}
+
+    def employee_tasks():
+        return "POST", "/employee/tasks", {"email": rng.choice(data.employees)}
+
+    def employee_update():
+        _, cid = any_complaint()
+        return "POST", "/employee/tasks/update", {"complaint_id": cid, "status": rng.choice(STATUSES)}
+
+    def employee_login():
+        return "POST", "/employee/login", {"email": rng.choice(data.employees), "password": PASSWORD}
+
+    def employees_list():
+        return "GET", "/employees/list", None
+
+    def users_login():
+        return "POST", "/users/login", {"email": rng.choice(data.users), "password": PASSWORD}
+
+    table = {
+        "register": (1.0, register),
+        "status": (1.0, status),
+        "status_batch": (0.5, status_batch),
+        "user_complaints": (1.0, user_complaints),
+        "admin_list": (0.5, admin_list),
+        "admin_list_filtered": (0.5, admin_list_filtered),
+        "admin_summary": (0.5, admin_summary),
+        "admin_export": (0.02, admin_export),
+        "admin_update": (1.0, admin_update),
+        "admin_update_batch": (0.2, admin_update_batch),
+        "employee_update": (1.0, employee_update),
+        "employees_list": (0.5, employees_list),
+    }
+    if data.employees:
+        table["employee_tasks"] = (1.0, employee_tasks)
+        table["employee_login"] = (0.1, employee_login)
+    if data.users:
+        table["users_login"] = (0.1, users_login)
+    return table
+
+
+# -----------------------------------
+# Driver
+# -----------------------------------
+def percentile(sorted_values, q: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def drive(client, factory, total: int, concurrency: int):
+    latencies, errors = [], 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = factory()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+    }
+
+
+async def run_once(args, customers: int):
+    import httpx
+    from backend.mongodb_service.main import app
+    from backend.mongodb_service.app.mongodb.db_connections import get_db
+    from backend.mongodb_service.app.mongodb.complaint_repository import complaint_cache
+    from backend.mongodb_service.app.mongodb.dashboard_counters import rebuild_counters
+
+    db = get_db()
+    if "bench" not in db.name:
+        sys.exit(f"Refusing to drop non-bench database {db.name!r}; set MONGODB_DATABASE_NAME_TEST")
+
+    data = await seed(db, customers, args.per_customer, args.employees, args.users, args.layout, args.seed)
+    complaint_cache.clear()
+    await rebuild_counters()
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            rng = random.Random(args.seed)
+            table = scenarios(data, rng)
+            only = set(args.only.split(",")) if args.only else None
+
+            for name, (weight, factory) in table.items():
+                if only and name not in only:
+                    continue
+                total = max(1, int(args.requests * weight))
+                # warm-up: connections, caches of the driver, JIT of pydantic validators
+                await drive(client, factory, min(total, args.concurrency), args.concurrency)
+                results[name] = await drive(client, factory, total, args.concurrency)
+                print(f"   {name:<22} {results[name]['throughput_rps']:>9} rps  p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+
+    return {
+        "customers": customers,
+        "complaints": len(data.complaint_ids),
+        "scenarios": results,
+    }
+
+
+# -----------------------------------
+# Serialization only (no mongod): the old route path – FastAPI
+# validating a List[Dict] return annotation and encoding through
+# JSONResponse – against returning ORJSONResponse directly, on rows
+# shaped like ITEM_ROW_PROJECTION
+# -----------------------------------
+def synthetic_rows(count: int, rng: random.Random):
+    now = datetime.utcnow()
+    return [
+        {
+            "complaint_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Customer {i}",
+            "mobile": f"9{rng.randrange(10**9):09d}",
+            "issue": "Synthetic complaint " + "x" * rng.randrange(20, 120),
+            "status": rng.choice(STATUSES),
+            "assigned_to": rng.choice([None, f"employee{rng.randrange(20)}@bench.local"]),
+            "created_at": now - timedelta(minutes=rng.randrange(100_000)),
+        }
+        for i in range(count)
+    ]
+
+
+def time_call(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return round(percentile(timings, 0.50) * 1000, 3)
+
+
+async def run_serialize(args):
+    from typing import Dict, List
+
+    import httpx
+    import orjson
+    from fastapi import FastAPI
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import ORJSONResponse
+
+    rng = random.Random(args.seed)
+    results = {}
+    for count in [int(n) for n in args.rows.split(",")]:
+        rows = synthetic_rows(count, rng)
+        app = FastAPI()
+
+        @app.get("/validated")
+        async def validated() -> List[Dict]:
+            return rows
+
+        @app.get("/orjson")
+        async def raw():
+            return ORJSONResponse(rows)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            routes = {}
+            for name in ("validated", "orjson"):
+                factory = lambda name=name: ("GET", f"/{name}", None)
+                await drive(client, factory, 5, 1)
+                routes[name] = await drive(client, factory, args.requests, 1)
+
+        results[count] = {
+            "route_p50_ms": {name: r["p50_ms"] for name, r in routes.items()},
+            "encode_p50_ms": {
+                "jsonable_encoder+json": time_call(lambda: json.dumps(jsonable_encoder(rows)).encode(), args.requests),
+                "orjson": time_call(lambda: orjson.dumps(rows), args.requests),
+            },
+        }
+        route = results[count]["route_p50_ms"]
+        print(f"   {count:>6} rows  route p50 {route['validated']} -> {route['orjson']} ms", file=sys.stderr)
+    return results
+
+
+def compare(current, baseline, tolerance: float):
+    """Print p95 deltas; return the scenarios that regressed past tolerance."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base or not base.get("p95_ms") or result["p95_ms"] is None:
+            continue
+        change = (result["p95_ms"] - base["p95_ms"]) / base["p95_ms"]
+        marker = "REGRESSION" if change > tolerance else ""
+        print(f"   {name:<22} p95 {base['p95_ms']:>9} -> {result['p95_ms']:>9} ms ({change:+.0%}) {marker}", file=sys.stderr)
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+async def main_async(args):
+    config = {k: v for k, v in vars(args).items() if k not in ("baseline", "out")}
+    # Warm and cold runs are not comparable; keep the settings with the report
+    config["single_flight_reuse_seconds"] = os.environ["SINGLE_FLIGHT_REUSE_SECONDS"]
+    config["complaint_cache_ttl_seconds"] = os.environ["COMPLAINT_CACHE_TTL_SECONDS"]
+
+    if args.command == "serialize":
+        print(json.dumps({"config": config, "rows": await run_serialize(args)}, indent=2))
+        return 0
+
+    if args.command == "scale":
+        curve = []
+        for size in [int(s) for s in args.sizes.split(",")]:
+            print(f"📈 {size} customers", file=sys.stderr)
+            curve.append(await run_once(args, size))
+        report = {"config": config, "scaling": curve}
+    else:
+        print(f"🏁 {args.customers} customers", file=sys.stderr)
+        report = {"config": config, **(await run_once(args, args.customers))}
+
+    exit_code = 0
+    if args.command == "run" and args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        report["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a bench database and load-test the routes")
+    parser.add_argument("command", choices=["run", "scale", "serialize"])
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="customer counts for `scale`")
+    parser.add_argument("--rows", default="100,500,5000", help="rows per response for `serialize`")
+    parser.add_argument("--per-customer", type=int, default=3, help="complaints per customer")
+    parser.add_argument("--employees", type=int, default=20)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--layout", choices=["items", "legacy"], default="items")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario (before weighting)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare p95 against this saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 increase before failing")
+    args = parser.parse_args()
+
+    raise SystemExit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
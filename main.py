@@ -1,8 +1,18 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 # DB setup
 from backend.mongodb_service.app.mongodb.db_connections import init_db, close_db
+from backend.mongodb_service.app.mongodb.change_events import watch_complaint_changes
+from backend.mongodb_service.app.core.passwords import shutdown_password_pool
+from backend.mongodb_service.app.core.config import complaint_events_change_stream
+from backend.mongodb_service.app.core.metrics import MetricsMiddleware, register_collector, render_metrics
 
 # Routers
 from backend.mongodb_service.app.apis.mongodb_routes import mongo_router
@@ -16,15 +26,35 @@ from backend.mongodb_service.app.apis.employee_routes import employee_router
 # ---------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    init_started = time.perf_counter()
     await init_db()
+    ready = time.perf_counter()
+
+    startup["init_db"] = ready - init_started
+    startup["ready"] = ready - _import_started
+    print(
+        f"🚀 Ready in {startup['ready'] * 1000:.0f} ms "
+        f"(imports {startup['imports'] * 1000:.0f} ms, init_db {startup['init_db'] * 1000:.0f} ms)"
+    )
+
+    # Live events from MongoDB instead of this process's writes
+    watcher = None
+    if complaint_events_change_stream:
+        watcher = asyncio.create_task(watch_complaint_changes())
+
     yield
+
+    if watcher:
+        watcher.cancel()
     await close_db()
+    shutdown_password_pool()
 
 
 # ---------------------------------------------------------
 # Create FastAPI app AFTER defining lifespan
 # ---------------------------------------------------------
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 
 # ---------------------------------------------------------
@@ -36,6 +66,27 @@ app.include_router(users_router)
 app.include_router(employee_router,prefix="")
 
 
+# ---------------------------------------------------------
+# Startup timing – imports (module load up to here) and
+# time until the lifespan reports ready, both measured from
+# the first line of this module.
+# ---------------------------------------------------------
+startup = {"imports": time.perf_counter() - _import_started}
+
+
+def startup_metric_lines():
+    lines = [
+        "# HELP service_startup_seconds Time spent starting the service, by phase.",
+        "# TYPE service_startup_seconds gauge",
+    ]
+    for phase, seconds in startup.items():
+        lines.append(f'service_startup_seconds{{phase="{phase}"}} {seconds}')
+    return lines
+
+
+register_collector("startup", startup_metric_lines)
+
+
 # ---------------------------------------------------------
 # Health check route
 # ---------------------------------------------------------
@@ -44,5 +95,13 @@ def root():
     return {"msg": "MongoDB Service Running"}
 
 
+# ---------------------------------------------------------
+# Prometheus metrics
+# ---------------------------------------------------------
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # Run using:
 # uvicorn backend.mongodb_service.main:app --reload --port 8001
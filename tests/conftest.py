@@ -0,0 +1,14 @@
+import pytest
+
+from backend.mongodb_service.app.core import single_flight
+from backend.mongodb_service.app.mongodb import write_queue
+
+
+@pytest.fixture(autouse=True)
+def restore_registries():
+    """Instances built by a test must not leak into later metric_lines() / drains."""
+    queues = list(write_queue._queues)
+    groups = list(single_flight._groups)
+    yield
+    write_queue._queues[:] = queues
+    single_flight._groups[:] = groups
@@ -0,0 +1,144 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.mongodb_service.app.mongodb import analytics
+from backend.mongodb_service.app.mongodb.complaint_repository import _after_update
+
+CREATED = datetime(2026, 10, 17, 22, 15)
+RESOLVED = datetime(2026, 10, 18, 1, 45)
+
+
+class FakeCollection:
+    def __init__(self):
+        self.ops = []
+
+    async def bulk_write(self, ops, ordered=True):
+        assert ordered is False
+        self.ops.extend(ops)
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    rollups, resolutions = FakeCollection(), FakeCollection()
+    monkeypatch.setattr(analytics, "rollups_col", lambda: rollups)
+    monkeypatch.setattr(analytics, "resolutions_col", lambda: resolutions)
+    return rollups, resolutions
+
+
+def record(changes):
+    asyncio.run(analytics.record_rollups(changes))
+
+
+def incs(collection):
+    return {op._filter["_id"]: op._doc["$inc"] for op in collection.ops}
+
+
+def pushes(collection):
+    return {op._filter["_id"]: op._doc["$push"]["seconds"]["$each"] for op in collection.ops}
+
+
+def item(**fields):
+    return {"_id": "c1", "status": "Pending", "assigned_to": None, "created_at": CREATED, "resolved_at": None, **fields}
+
+
+def test_new_complaint_counts_as_created_per_hour_and_day(collections):
+    rollups, resolutions = collections
+    record([(None, item())])
+
+    assert incs(rollups) == {
+        "hour|2026-10-17T22": {"created": 1},
+        "day|2026-10-17": {"created": 1},
+    }
+    assert resolutions.ops == []
+
+
+def test_bucket_start_goes_in_on_insert(collections):
+    rollups, _ = collections
+    record([(None, item())])
+
+    starts = {op._filter["_id"]: op._doc["$setOnInsert"]["bucket"] for op in rollups.ops}
+    assert starts["hour|2026-10-17T22"] == datetime(2026, 10, 17, 22)
+    assert starts["day|2026-10-17"] == datetime(2026, 10, 17)
+
+
+def test_resolution_counts_in_the_resolved_buckets_with_its_duration(collections):
+    rollups, resolutions = collections
+    before = item(assigned_to="a@x.com")
+    after = item(status="Resolved", assigned_to="a@x.com", resolved_at=RESOLVED)
+    record([(before, after)])
+
+    assert incs(rollups) == {
+        "hour|2026-10-18T01": {"resolved": 1},
+        "day|2026-10-18": {"resolved": 1},
+    }
+    assert pushes(resolutions) == {"2026-10-18|a@x.com": [(RESOLVED - CREATED).total_seconds()]}
+
+
+def test_moving_between_resolved_statuses_is_not_a_new_resolution(collections):
+    rollups, resolutions = collections
+    before = item(status="Resolved", resolved_at=RESOLVED)
+    after = item(status="Closed", resolved_at=RESOLVED)
+    record([(before, after)])
+
+    assert rollups.ops == [] and resolutions.ops == []
+
+
+def test_closing_a_legacy_resolved_item_books_no_resolution(collections):
+    # Migrated legacy items are Resolved with resolved_at null
+    rollups, resolutions = collections
+    before = item(status="Resolved")
+    record([
+        (before, _after_update(before, {"status": "Closed"}, RESOLVED)),
+        (before, _after_update(before, {"status": "Resolved", "assigned_to": "a@x.com"}, RESOLVED)),
+    ])
+
+    assert rollups.ops == [] and resolutions.ops == []
+
+
+def test_reassignment_records_nothing(collections):
+    rollups, resolutions = collections
+    record([(item(), item(assigned_to="a@x.com"))])
+
+    assert rollups.ops == [] and resolutions.ops == []
+
+
+def test_batch_sums_per_bucket_and_groups_durations(collections):
+    rollups, resolutions = collections
+    changes = [
+        (None, item(_id="c1")),
+        (None, item(_id="c2", created_at=CREATED + timedelta(minutes=30))),
+        (item(_id="c3"), item(_id="c3", status="Closed", resolved_at=RESOLVED)),
+        (item(_id="c4"), item(_id="c4", status="Resolved", resolved_at=RESOLVED + timedelta(hours=1))),
+    ]
+    record(changes)
+
+    assert incs(rollups) == {
+        "hour|2026-10-17T22": {"created": 2},
+        "day|2026-10-17": {"created": 2},
+        "hour|2026-10-18T01": {"resolved": 1},
+        "hour|2026-10-18T02": {"resolved": 1},
+        "day|2026-10-18": {"resolved": 2},
+    }
+    assert pushes(resolutions) == {
+        "2026-10-18|": [(RESOLVED - CREATED).total_seconds(), (RESOLVED - CREATED).total_seconds() + 3600],
+    }
+
+
+def test_created_and_resolved_in_one_change(collections):
+    rollups, resolutions = collections
+    record([(None, item(status="Resolved", resolved_at=CREATED))])
+
+    assert incs(rollups) == {
+        "hour|2026-10-17T22": {"created": 1, "resolved": 1},
+        "day|2026-10-17": {"created": 1, "resolved": 1},
+    }
+    assert pushes(resolutions) == {"2026-10-17|": [0.0]}
+
+
+def test_rows_without_created_at_are_skipped(collections):
+    rollups, resolutions = collections
+    record([(None, item(created_at=None)), (item(created_at=None), None)])
+
+    assert rollups.ops == [] and resolutions.ops == []
@@ -0,0 +1,90 @@
+import asyncio
+import io
+import json
+
+from backend.mongodb_service.app.models.data_models import RegisterComplaint
+from backend.mongodb_service.app.mongodb import bulk_ingest
+from backend.mongodb_service.app.mongodb.bulk_ingest import ingest_records, iter_records
+
+
+def text(data: bytes):
+    # The route and the CLI both decode uploads this way
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+
+
+def ndjson(*rows):
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+def complaint(mobile="9000000000", details="No water"):
+    return {"name": "Asha", "mobile_number": mobile, "complaints": {"complaint_details": details}}
+
+
+def test_csv_rows_become_records():
+    data = b"name,mobile_number,complaint_details\nAsha,9000000000,No water\nRavi,9111111111,Power cut\n"
+    rows = list(iter_records(text(data), "csv"))
+
+    assert [n for n, _ in rows] == [1, 2]
+    assert all(isinstance(record, RegisterComplaint) for _, record in rows)
+    assert rows[1][1].complaints.complaint_details == "Power cut"
+
+
+def test_csv_with_a_bom_keeps_the_first_header():
+    data = b"\xef\xbb\xbfname,mobile_number,complaint_details\nAsha,9000000000,No water\n"
+    ((_, record),) = iter_records(text(data), "csv")
+    assert record.name == "Asha"
+
+
+def test_invalid_csv_row_is_reported_with_its_number():
+    data = b"name,mobile_number,complaint_details\nAsha,123,No water\nRavi,9111111111,Power cut\n"
+    rows = list(iter_records(text(data), "csv"))
+
+    assert isinstance(rows[0][1], str) and "mobile_number" in rows[0][1]
+    assert rows[1][0] == 2 and isinstance(rows[1][1], RegisterComplaint)
+
+
+def test_ndjson_skips_blank_lines_and_reports_bad_ones():
+    data = ndjson(complaint()) + b"\n\n{not json\n" + ndjson(complaint(mobile="9111111111"))
+    rows = list(iter_records(text(data), "ndjson"))
+
+    assert [n for n, _ in rows] == [1, 2, 3]
+    assert isinstance(rows[0][1], RegisterComplaint)
+    assert isinstance(rows[1][1], str)
+    assert rows[2][1].mobile_number == "9111111111"
+
+
+def records(count):
+    return [(n, RegisterComplaint(**complaint(details=f"issue {n}"))) for n in range(1, count + 1)]
+
+
+def test_ingest_reports_every_row_in_order(monkeypatch):
+    async def register(batch):
+        return [f"id-{r.complaints.complaint_details}" for r in batch]
+
+    monkeypatch.setattr(bulk_ingest, "register_complaints_bulk", register)
+    rows = [(1, "mobile_number: too short"), *records(3)[1:]]
+    summary = asyncio.run(ingest_records(rows, batch_size=1))
+
+    assert (summary["rows"], summary["inserted"], summary["failed"]) == (3, 2, 1)
+    assert summary["results"] == [
+        {"row": 1, "error": "mobile_number: too short"},
+        {"row": 2, "complaint_id": "id-issue 2"},
+        {"row": 3, "complaint_id": "id-issue 3"},
+    ]
+
+
+def test_failed_batch_is_reported_per_row_and_ingestion_goes_on(monkeypatch):
+    calls = []
+
+    async def register(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        return ["id"] * len(batch)
+
+    monkeypatch.setattr(bulk_ingest, "register_complaints_bulk", register)
+    summary = asyncio.run(ingest_records(records(3), batch_size=2))
+
+    assert calls == [2, 1]
+    assert summary["failed"] == 2
+    assert [r.get("error", "").startswith("batch failed") for r in summary["results"]] == [True, True, False]
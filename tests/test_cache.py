@@ -0,0 +1,70 @@
+from cachetools import TTLCache
+
+from backend.mongodb_service.app.core.cache import MISSING, ReadCache
+
+
+def test_miss_then_hit():
+    cache = ReadCache("test", maxsize=10, ttl=60)
+
+    assert cache.get("k") is MISSING
+    cache.set("k", {"status": "Pending"})
+    assert cache.get("k") == {"status": "Pending"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_none_is_a_hit():
+    cache = ReadCache("test", maxsize=10, ttl=60)
+    cache.set("k", None)
+    assert cache.get("k") is None
+
+
+def test_invalidate_drops_only_the_given_keys():
+    cache = ReadCache("test", maxsize=10, ttl=60)
+    cache.set(("customer", "9000000000"), [])
+    cache.set(("status", "9000000000", "c1"), {})
+    cache.set(("customer", "9111111111"), [])
+
+    cache.invalidate(("customer", "9000000000"), ("status", "9000000000", "c1"))
+
+    assert cache.get(("customer", "9000000000")) is MISSING
+    assert cache.get(("status", "9000000000", "c1")) is MISSING
+    assert cache.get(("customer", "9111111111")) == []
+    assert cache.invalidations == 2
+
+
+def test_invalidating_absent_keys_is_not_counted():
+    cache = ReadCache("test", maxsize=10, ttl=60)
+    cache.invalidate(("customer", "nobody"))
+    assert cache.invalidations == 0
+
+
+def test_lru_eviction_at_maxsize():
+    cache = ReadCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    now = [0.0]
+    cache = ReadCache("test", maxsize=10, ttl=5)
+    cache._entries = TTLCache(maxsize=10, ttl=5, timer=lambda: now[0])
+
+    cache.set("k", 1)
+    now[0] = 4.9
+    assert cache.get("k") == 1
+    now[0] = 5.1
+    assert cache.get("k") is MISSING
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = ReadCache("test", maxsize=10, ttl=0)
+    cache.set("k", 1)
+
+    assert not cache.enabled
+    assert cache.get("k") is MISSING
+    assert cache.stats()["size"] == 0
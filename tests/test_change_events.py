@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from backend.mongodb_service.app.mongodb import change_events
+from backend.mongodb_service.app.mongodb.complaint_repository import complaint_events, list_versions
+
+
+def insert_change(complaint_id: str):
+    return {
+        "operationType": "insert",
+        "fullDocument": {
+            "_id": complaint_id,
+            "mobile_number": "9000000000",
+            "status": "Pending",
+            "assigned_to": None,
+        },
+    }
+
+
+class FakeWatch:
+    """One watch() call: fails on open, or yields changes and then fails."""
+
+    def __init__(self, changes=(), error=None, fail_on_open=False):
+        self.changes = changes
+        self.error = error
+        self.fail_on_open = fail_on_open
+        self.resume_token = None
+
+    async def __aenter__(self):
+        if self.fail_on_open:
+            raise self.error
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _changes(self):
+        for token, change in self.changes:
+            self.resume_token = token
+            yield change
+        raise self.error
+
+    def __aiter__(self):
+        return self._changes()
+
+
+class FakeCollection:
+    def __init__(self, watches):
+        self.watches = list(watches)
+        self.resumed_from = []
+
+    def watch(self, pipeline, full_document=None, resume_after=None):
+        self.resumed_from.append(resume_after)
+        return self.watches.pop(0)
+
+
+def watch_with(monkeypatch, watches):
+    collection = FakeCollection(watches)
+    monkeypatch.setattr(change_events, "complaint_items_col", lambda: collection)
+    monkeypatch.setattr(change_events, "RETRY_SECONDS", 0)
+    return collection
+
+
+def test_resumes_from_the_last_token_after_an_error(monkeypatch):
+    collection = watch_with(monkeypatch, [
+        FakeWatch([("t1", insert_change("c1"))], error=OperationFailure("network", code=6)),
+        FakeWatch(error=asyncio.CancelledError(), fail_on_open=True),
+    ])
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(change_events.watch_complaint_changes())
+    assert collection.resumed_from == [None, "t1"]
+
+
+def test_lost_resume_token_restarts_from_now_and_resyncs(monkeypatch):
+    collection = watch_with(monkeypatch, [
+        FakeWatch([("t1", insert_change("c1"))], error=OperationFailure("network", code=6)),
+        FakeWatch(error=OperationFailure("history lost", code=286), fail_on_open=True),
+        FakeWatch(error=asyncio.CancelledError(), fail_on_open=True),
+    ])
+
+    async def scenario():
+        subscription = complaint_events.subscribe()
+        epoch = list_versions.epoch
+        with pytest.raises(asyncio.CancelledError):
+            await change_events.watch_complaint_changes()
+
+        assert (await subscription.next(1))["complaint_id"] == "c1"
+        assert await subscription.next(1) is None       # resync marker
+        assert list_versions.epoch != epoch             # old ETags stop matching
+
+    asyncio.run(scenario())
+    assert collection.resumed_from == [None, "t1", None]
+
+
+def test_other_errors_keep_the_token(monkeypatch):
+    collection = watch_with(monkeypatch, [
+        FakeWatch([("t1", insert_change("c1"))], error=OperationFailure("network", code=6)),
+        FakeWatch(error=OperationFailure("not primary", code=10107), fail_on_open=True),
+        FakeWatch(error=asyncio.CancelledError(), fail_on_open=True),
+    ])
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(change_events.watch_complaint_changes())
+    assert collection.resumed_from == [None, "t1", "t1"]
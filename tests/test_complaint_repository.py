@@ -0,0 +1,357 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.mongodb_service.app.mongodb import complaint_repository
+from backend.mongodb_service.app.mongodb.complaint_repository import (
+    _after_cursor,
+    apply_complaint_updates,
+    _after_update,
+    _status_update,
+    decode_cursor,
+    encode_cursor,
+    parse_status,
+    status_filter,
+    update_complaint_fields,
+)
+
+
+# -----------------------------------
+# Just enough of MongoDB's query / expression semantics to evaluate
+# the filters and update pipelines built by the repository
+# -----------------------------------
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+            continue
+
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:          # {"created_at": None} also matches missing
+                return False
+            continue
+
+        for op, operand in condition.items():
+            if op == "$ne":
+                ok = value != operand
+            else:
+                # Comparisons only match values of the same type – never null
+                ok = value is not None and operand is not None and (
+                    value < operand if op == "$lt" else value > operand
+                )
+            if not ok:
+                return False
+    return True
+
+
+def evaluate(expr, doc):
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, list):
+        return [evaluate(e, doc) for e in expr]
+    if not isinstance(expr, dict):
+        return expr
+
+    if len(expr) != 1 or not next(iter(expr)).startswith("$"):
+        return {key: evaluate(value, doc) for key, value in expr.items()}
+
+    (op, args), = expr.items()
+    if op == "$literal":
+        return args
+    if op == "$ifNull":
+        value = evaluate(args[0], doc)
+        return value if value is not None else evaluate(args[1], doc)
+    if op == "$cond":
+        return evaluate(args[1] if evaluate(args[0], doc) else args[2], doc)
+    if op == "$ne":
+        return evaluate(args[0], doc) != evaluate(args[1], doc)
+    if op == "$in":
+        return evaluate(args[0], doc) in evaluate(args[1], doc)
+    if op == "$concatArrays":
+        return [item for part in args for item in evaluate(part, doc)]
+    raise NotImplementedError(op)
+
+
+def apply_pipeline(doc, pipeline):
+    for stage in pipeline:
+        (name, fields), = stage.items()
+        assert name == "$set"
+        doc = {**doc, **{key: evaluate(expr, doc) for key, expr in fields.items()}}
+    return doc
+
+
+# -----------------------------------
+# Keyset cursor
+# -----------------------------------
+T0 = datetime(2026, 10, 1, 12, 0)
+
+ROWS = [
+    {"_id": "a", "created_at": None},
+    {"_id": "b", "created_at": None},
+    {"_id": "c", "created_at": T0},
+    {"_id": "d", "created_at": T0},
+    {"_id": "e", "created_at": T0 + timedelta(minutes=1)},
+    {"_id": "f"},                                   # created_at missing
+]
+
+
+def sort_key(row):
+    # MongoDB sorts null / missing below every date
+    created_at = row.get("created_at")
+    return (created_at is not None, created_at or datetime.min, row["_id"])
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_cursor_returns_exactly_the_rows_after_each_position(descending):
+    ordered = sorted(ROWS, key=sort_key, reverse=descending)
+
+    for position, row in enumerate(ordered):
+        query = _after_cursor(row.get("created_at"), row["_id"], descending, "_id")
+        after = sorted((r for r in ROWS if matches(r, query)), key=sort_key, reverse=descending)
+        assert [r["_id"] for r in after] == [r["_id"] for r in ordered[position + 1:]], row
+
+
+def test_cursor_on_a_null_created_at_keeps_dated_rows_ascending_only():
+    ascending = _after_cursor(None, "a", False, "_id")
+    descending = _after_cursor(None, "a", True, "_id")
+
+    assert matches({"_id": "c", "created_at": T0}, ascending)
+    assert not matches({"_id": "c", "created_at": T0}, descending)
+
+
+def test_cursor_uses_the_given_id_field():
+    query = _after_cursor(T0, "c", False, "complaint_id")
+    assert matches({"complaint_id": "d", "created_at": T0}, query)
+    assert not matches({"complaint_id": "b", "created_at": T0}, query)
+
+
+def b64(payload) -> str:
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+@pytest.mark.parametrize("created_at", [T0, None])
+def test_cursor_round_trip(created_at):
+    cursor = encode_cursor({"complaint_id": "c1", "created_at": created_at})
+    assert decode_cursor(cursor) == (created_at, "c1")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        b64(b"\xff\xfe"),                                      # not UTF-8
+        b64(b"not json"),
+        b64(json.dumps([1, 2]).encode()),
+        b64(json.dumps({"id": "c1"}).encode()),                 # no "t"
+        b64(json.dumps({"t": None}).encode()),                  # no "id"
+        b64(json.dumps({"t": "yesterday", "id": "c1"}).encode()),
+        b64(json.dumps({"t": 5, "id": "c1"}).encode()),
+        b64(json.dumps({"t": None, "id": {"$gt": ""}}).encode()),
+    ],
+)
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+# -----------------------------------
+# Status update pipeline and its Python twin
+# -----------------------------------
+NOW = datetime(2026, 10, 18, 9, 30)
+CREATED = datetime(2026, 10, 17, 9, 30)
+
+
+def stored(**fields):
+    return {
+        "_id": "c1",
+        "mobile_number": "9000000000",
+        "status": "Pending",
+        "assigned_to": None,
+        "created_at": CREATED,
+        "resolved_at": None,
+        "status_history": [{"status": "Pending", "at": CREATED}],
+        **fields,
+    }
+
+
+def test_values_go_in_as_literals():
+    pipeline = _status_update({"assigned_to": "$where", "status": "Pending"}, NOW)
+    (stage,) = [step["$set"] for step in pipeline]
+
+    assert stage["assigned_to"] == {"$literal": "$where"}
+    assert apply_pipeline(stored(), pipeline)["assigned_to"] == "$where"
+
+
+def test_new_status_is_appended_to_the_history():
+    after = apply_pipeline(stored(), _status_update({"status": "In Progress"}, NOW))
+
+    assert after["status"] == "In Progress"
+    assert after["status_history"][-1] == {"status": "In Progress", "at": NOW}
+    assert len(after["status_history"]) == 2
+
+
+def test_same_status_leaves_the_history_alone():
+    after = apply_pipeline(stored(), _status_update({"status": "Pending"}, NOW))
+    assert after["status_history"] == stored()["status_history"]
+
+
+def test_history_starts_on_documents_without_one():
+    doc = stored()
+    del doc["status_history"]
+
+    after = apply_pipeline(doc, _status_update({"status": "Closed"}, NOW))
+    assert after["status_history"] == [{"status": "Closed", "at": NOW}]
+
+
+def test_assignee_only_update_does_not_touch_status_fields():
+    pipeline = _status_update({"assigned_to": "a@x.com"}, NOW)
+    (stage,) = [step["$set"] for step in pipeline]
+    assert set(stage) == {"assigned_to"}
+
+
+@pytest.mark.parametrize(
+    "before, fields, resolved_at",
+    [
+        (stored(), {"status": "Resolved"}, NOW),                                            # resolving stamps
+        (stored(status="Resolved", resolved_at=CREATED), {"status": "Closed"}, CREATED),    # kept between resolved
+        (stored(status="Resolved", resolved_at=CREATED), {"status": "In Progress"}, None),  # reopening clears
+        (stored(status="Closed", resolved_at=CREATED), {"assigned_to": "a@x.com"}, CREATED),
+        (stored(), {"status": "In Progress", "assigned_to": "a@x.com"}, None),
+        # Migrated legacy items are resolved without a resolved_at: it stays null
+        (stored(status="Resolved"), {"status": "Closed"}, None),
+        (stored(status="Closed"), {"status": "Closed", "assigned_to": "a@x.com"}, None),
+    ],
+)
+def test_after_update_matches_the_pipeline(before, fields, resolved_at):
+    written = apply_pipeline(before, _status_update(fields, NOW))
+    predicted = _after_update(before, fields, NOW)
+
+    assert written["resolved_at"] == predicted["resolved_at"] == resolved_at
+    for field in ("status", "assigned_to", "created_at", "mobile_number"):
+        assert written[field] == predicted[field]
+
+
+# -----------------------------------
+# Client-sent statuses
+# -----------------------------------
+@pytest.mark.parametrize(
+    "sent, label",
+    [("pending", "Pending"), ("Open", "Pending"), ("IN PROGRESS", "In Progress"), ("resolved", "Resolved"), ("Closed", "Closed")],
+)
+def test_known_statuses_map_to_their_label(sent, label):
+    assert parse_status(sent) == label
+    assert status_filter(sent) == label
+
+
+@pytest.mark.parametrize("sent", ["Resloved", "done", ""])
+def test_unknown_status_is_a_400(sent):
+    with pytest.raises(HTTPException) as exc:
+        parse_status(sent)
+    assert exc.value.status_code == 400
+
+
+def test_no_status_filter_means_any():
+    assert status_filter(None) is None
+    assert status_filter("") is None
+
+
+def test_update_with_unknown_status_is_rejected_before_queueing():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(update_complaint_fields("c1", status="Resloved"))
+    assert exc.value.status_code == 400
+
+
+# -----------------------------------
+# Write-queue flush: compare-and-set against concurrent writers
+# -----------------------------------
+class FakeItems:
+    """complaint_items in memory; interfere(doc) plays another pod writing first."""
+
+    def __init__(self, *docs, interfere=None):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.interfere = interfere
+        self.updates = 0
+
+    def find(self, query, projection):
+        async def cursor():
+            for cid in query["_id"]["$in"]:
+                if cid in self.docs:
+                    yield dict(self.docs[cid])
+        return cursor()
+
+    async def update_one(self, query, pipeline):
+        self.updates += 1
+        doc = self.docs.get(query["_id"])
+        if doc and self.interfere:
+            self.interfere(doc)
+        matched = doc is not None and all(doc.get(k) == v for k, v in query.items() if k != "_id")
+        if matched:
+            self.docs[doc["_id"]] = apply_pipeline(doc, pipeline)
+        return SimpleNamespace(matched_count=int(matched))
+
+
+@pytest.fixture
+def flush(monkeypatch):
+    reported = []
+
+    async def complaints_changed(changes):
+        reported.extend(changes)
+
+    monkeypatch.setattr(complaint_repository, "complaints_changed", complaints_changed)
+    monkeypatch.setattr(complaint_repository, "complaint_legacy_reads", False)
+
+    def run_flush(items, batch):
+        monkeypatch.setattr(complaint_repository, "complaint_items_col", lambda: items)
+        return asyncio.run(apply_complaint_updates(batch)), reported
+
+    return run_flush
+
+
+def test_flush_applies_and_reports_each_change(flush):
+    items = FakeItems(stored())
+    results, reported = flush(items, {"c1": {"status": "In Progress"}, "gone": {"status": "Closed"}})
+
+    assert results == {"c1": True, "gone": False}
+    assert items.docs["c1"]["status"] == "In Progress"
+    ((before, after),) = reported
+    assert (before["status"], after["status"]) == ("Pending", "In Progress")
+
+
+def test_flush_retries_on_top_of_a_concurrent_write(flush):
+    def other_pod(doc):
+        # Reassigns between our read and our write, once
+        if doc["assigned_to"] is None:
+            doc["assigned_to"] = "b@x.com"
+
+    items = FakeItems(stored(), interfere=other_pod)
+    results, reported = flush(items, {"c1": {"status": "Resolved"}})
+
+    assert results == {"c1": True}
+    assert items.updates == 2
+    assert items.docs["c1"]["status"] == "Resolved"
+    assert items.docs["c1"]["assigned_to"] == "b@x.com"
+
+    # The reported before is the document the write replaced, so the
+    # counters move b@x.com's complaint, not an unassigned one
+    ((before, after),) = reported
+    assert before["assigned_to"] == after["assigned_to"] == "b@x.com"
+
+
+def test_flush_gives_up_with_409_when_the_complaint_keeps_changing(flush):
+    def busy_pod(doc):
+        doc["assigned_to"] = f"{items.updates}@x.com"
+
+    items = FakeItems(stored(), interfere=busy_pod)
+    results, reported = flush(items, {"c1": {"status": "Closed"}})
+
+    assert items.updates == complaint_repository.MAX_UPDATE_ATTEMPTS
+    assert isinstance(results["c1"], HTTPException) and results["c1"].status_code == 409
+    assert reported == []
@@ -0,0 +1,42 @@
+from backend.mongodb_service.app.mongodb.dashboard_counters import counter_deltas, counter_key
+
+
+def item(status, assigned_to=None):
+    return {"status": status, "assigned_to": assigned_to}
+
+
+def test_new_complaint_counts_once():
+    assert counter_deltas([(None, item("Pending"))]) == {("Pending", None): 1}
+
+
+def test_status_change_moves_one_between_counters():
+    deltas = counter_deltas([(item("Pending", "a@x.com"), item("Resolved", "a@x.com"))])
+    assert deltas == {("Pending", "a@x.com"): -1, ("Resolved", "a@x.com"): 1}
+
+
+def test_reassignment_moves_between_assignees():
+    deltas = counter_deltas([(item("In Progress", "a@x.com"), item("In Progress", "b@x.com"))])
+    assert deltas == {("In Progress", "a@x.com"): -1, ("In Progress", "b@x.com"): 1}
+
+
+def test_unchanged_complaint_leaves_no_delta():
+    assert counter_deltas([(item("Pending"), item("Pending"))]) == {}
+
+
+def test_batch_nets_out_per_counter():
+    changes = [
+        (None, item("Pending")),
+        (None, item("Pending")),
+        (item("Pending"), item("In Progress", "a@x.com")),
+        (item("In Progress", "a@x.com"), item("Pending")),
+    ]
+    assert counter_deltas(changes) == {("Pending", None): 2}
+
+
+def test_missing_assignee_is_none():
+    assert counter_deltas([(None, {"status": "Pending"})]) == {("Pending", None): 1}
+
+
+def test_counter_key():
+    assert counter_key("Pending", None) == "Pending|"
+    assert counter_key("Resolved", "a@x.com") == "Resolved|a@x.com"
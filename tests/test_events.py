@@ -0,0 +1,100 @@
+import asyncio
+
+from backend.mongodb_service.app.core.events import EventBus
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_subscribers_receive_published_events_in_order():
+    async def scenario():
+        bus = EventBus("test", queue_size=10)
+        subscription = bus.subscribe()
+
+        bus.publish({"complaint_id": "c1"})
+        bus.publish({"complaint_id": "c2"})
+
+        assert await subscription.next(1) == {"complaint_id": "c1"}
+        assert await subscription.next(1) == {"complaint_id": "c2"}
+        assert bus.published == 2
+
+    run(scenario())
+
+
+def test_filter_skips_events_the_subscriber_does_not_want():
+    async def scenario():
+        bus = EventBus("test", queue_size=10)
+        subscription = bus.subscribe(lambda event: event["assigned_to"] == "a@x.com")
+
+        bus.publish({"complaint_id": "c1", "assigned_to": "b@x.com"})
+        bus.publish({"complaint_id": "c2", "assigned_to": "a@x.com"})
+
+        assert (await subscription.next(1))["complaint_id"] == "c2"
+        assert subscription.queue.empty()
+
+    run(scenario())
+
+
+def test_idle_subscription_gets_a_heartbeat():
+    async def scenario():
+        subscription = EventBus("test", queue_size=10).subscribe()
+        assert await subscription.next(0.01) == "heartbeat"
+
+    run(scenario())
+
+
+def test_full_subscriber_is_dropped_with_an_end_marker():
+    async def scenario():
+        bus = EventBus("test", queue_size=2)
+        slow = bus.subscribe()
+        fast = bus.subscribe()
+
+        for n in range(3):
+            bus.publish({"n": n})
+            await fast.next(1)
+
+        # The slow one overflowed on the third event: dropped, and the
+        # oldest event made room for None, which tells the endpoint to
+        # have its client refetch
+        assert slow not in bus.subscribers
+        assert fast in bus.subscribers
+        assert bus.dropped == 1
+        assert await slow.next(1) == {"n": 1}
+        assert await slow.next(1) is None
+
+        bus.publish({"n": 3})
+        assert slow.queue.empty()
+
+    run(scenario())
+
+
+def test_close_unsubscribes():
+    async def scenario():
+        bus = EventBus("test", queue_size=2)
+        subscription = bus.subscribe()
+        subscription.close()
+
+        bus.publish({"n": 1})
+        assert subscription.queue.empty()
+        assert not bus.subscribers
+
+    run(scenario())
+
+
+def test_resync_ends_every_subscription():
+    async def scenario():
+        bus = EventBus("test", queue_size=2)
+        idle = bus.subscribe()
+        full = bus.subscribe()
+        full.queue.put_nowait({"n": 0})
+        full.queue.put_nowait({"n": 1})
+
+        bus.resync()
+
+        assert not bus.subscribers
+        assert await idle.next(1) is None
+        assert await full.next(1) == {"n": 1}
+        assert await full.next(1) is None
+
+    run(scenario())
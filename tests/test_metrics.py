@@ -0,0 +1,47 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.mongodb_service.app.core.metrics import command_metrics
+
+parser = pytest.importorskip("prometheus_client.parser")
+
+
+def command(name: str, micros: int):
+    return SimpleNamespace(command_name=name, duration_micros=micros)
+
+
+def scrape():
+    from backend.mongodb_service.main import app
+
+    async def get():
+        # No lifespan: /metrics needs no database
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/no-such-route")
+            return await client.get("/metrics")
+
+    return asyncio.run(get())
+
+
+def test_metrics_parse_with_one_family_per_name():
+    command_metrics.succeeded(command("find", 1500))
+    command_metrics.succeeded(command("aggregate", 2500))
+    command_metrics.failed(command("find", 500))
+
+    response = scrape()
+    assert response.status_code == 200
+
+    families = list(parser.text_string_to_metric_families(response.text))
+    names = [family.name for family in families]
+    assert len(names) == len(set(names)), sorted(name for name in names if names.count(name) > 1)
+
+    # Every sample was claimed by a typed family, none fell through as "unknown"
+    assert all(family.type != "unknown" for family in families)
+
+    by_name = {family.name: family for family in families}
+    for name in ("mongodb_commands", "mongodb_command_failures", "mongodb_command_seconds"):
+        assert {s.labels["command"] for s in by_name[name].samples} >= {"find", "aggregate"}
+    assert "http_request_duration_seconds" in by_name
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from backend.mongodb_service.app.core.single_flight import SingleFlight, metric_lines
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test_shared")
+        calls = 0
+        release = asyncio.Event()
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return b"rows"
+
+        callers = [asyncio.ensure_future(flight.run("page-1", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == [b"rows"] * 5
+        assert calls == 1
+        assert (flight.executions, flight.collapsed) == (1, 4)
+
+    run(scenario())
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight("test_keys")
+
+        async def load(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.run("a", lambda: load("a")),
+            flight.run("b", lambda: load("b")),
+        )
+        assert results == ["a", "b"]
+        assert flight.executions == 2
+
+    run(scenario())
+
+
+def test_without_reuse_a_finished_key_runs_again():
+    async def scenario():
+        flight = SingleFlight("test_no_reuse")
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.run("k", load) == 1
+        assert await flight.run("k", load) == 2
+        assert flight.reused == 0
+
+    run(scenario())
+
+
+def test_reuse_window_serves_the_recent_result():
+    async def scenario():
+        flight = SingleFlight("test_reuse", reuse_seconds=60)
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.run("k", load) == 1
+        assert await flight.run("k", load) == 1
+        assert (calls, flight.reused) == (1, 1)
+
+    run(scenario())
+
+
+def test_errors_reach_every_caller_and_are_not_reused():
+    async def scenario():
+        flight = SingleFlight("test_errors", reuse_seconds=60)
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("query failed")
+
+        results = await asyncio.gather(flight.run("k", load), flight.run("k", load), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        with pytest.raises(RuntimeError):
+            await flight.run("k", load)
+        assert calls == 2
+
+    run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_work():
+    async def scenario():
+        flight = SingleFlight("test_cancel")
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "done"
+
+        leaving = asyncio.ensure_future(flight.run("k", load))
+        staying = asyncio.ensure_future(flight.run("k", load))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        release.set()
+        assert await staying == "done"
+
+    run(scenario())
+
+
+def test_metric_families_are_emitted_once_for_all_groups():
+    SingleFlight("test_metrics_a")
+    SingleFlight("test_metrics_b")
+
+    lines = metric_lines()
+    type_lines = [line for line in lines if line.startswith("# TYPE")]
+    assert len(type_lines) == len(set(type_lines)) == 4
+    assert 'single_flight_executions_total{group="test_metrics_a"} 0' in lines
+    assert 'single_flight_executions_total{group="test_metrics_b"} 0' in lines
+
+    # Groups built by earlier tests are gone (restore_registries)
+    groups = {line.split('group="')[1].split('"')[0] for line in lines if 'group="' in line}
+    assert {group for group in groups if group.startswith("test_")} == {"test_metrics_a", "test_metrics_b"}
+
+    # Every sample follows its own family's TYPE line
+    family = None
+    for line in lines:
+        if line.startswith("# TYPE"):
+            family = line.split()[2]
+        else:
+            assert line.startswith(family + "{")
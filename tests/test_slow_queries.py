@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+
+from backend.mongodb_service.app.core.slow_queries import SlowQueryRecorder, command_shape, redact
+
+
+def test_literals_become_type_names():
+    assert redact({"mobile_number": "9000000000", "created_at": {"$lt": datetime(2026, 10, 1)}}) == {
+        "mobile_number": "<str>",
+        "created_at": {"$lt": "<datetime>"},
+    }
+
+
+def test_pipelines_keep_stages_and_plain_arrays_collapse():
+    pipeline = [{"$match": {"_id": {"$in": ["c1", "c2", "c3"]}}}, {"$limit": 10}]
+    assert redact(pipeline) == [{"$match": {"_id": {"$in": ["?"]}}}, {"$limit": "<int>"}]
+    assert redact([]) == []
+
+
+def test_command_shape_keeps_name_and_collection_and_drops_driver_fields():
+    command = {
+        "find": "complaint_items",
+        "filter": {"status": "Pending"},
+        "limit": 100,
+        "lsid": {"id": "session"},
+        "$db": "helpdesk",
+    }
+    assert command_shape(command) == {
+        "find": "complaint_items",
+        "filter": {"status": "<str>"},
+        "limit": "<int>",
+    }
+
+
+def legacy_lookup(complaint_id: str):
+    return {
+        "find": "complaints",
+        "filter": {"mobile_number": "9000000000", f"complaints.{complaint_id}": {"$exists": True}},
+        "projection": {f"complaints.{complaint_id}.status": 1, "name": 1},
+    }
+
+
+def test_legacy_complaint_ids_do_not_make_new_shapes():
+    first, second = command_shape(legacy_lookup("c-1")), command_shape(legacy_lookup("c-2"))
+
+    assert first == second
+    assert "c-1" not in json.dumps(first)
+    assert first["projection"] == {"complaints.<key>.status": "<int>", "name": "<int>"}
+
+
+def test_legacy_complaints_map_collapses_to_one_key():
+    update = {"$set": {"complaints": {"c-1": {"status": "Pending"}, "c-2": {"status": "Closed"}}}}
+    assert redact(update) == {"$set": {"complaints": {"<key>": {"status": "<str>"}}}}
+
+    # Operators under the field are not data keys
+    assert redact({"complaints": {"$exists": True}}) == {"complaints": {"$exists": "<bool>"}}
+
+
+def test_each_shape_is_explained_once_per_interval():
+    recorder = SlowQueryRecorder()
+    recorder.explain, recorder._loop, recorder._db = True, object(), object()
+
+    shape = command_shape(legacy_lookup("c-1"))
+    assert recorder._should_explain("find", shape)
+    assert not recorder._should_explain("find", command_shape(legacy_lookup("c-2")))
+    assert recorder._should_explain("find", command_shape({"find": "complaint_items", "filter": {}}))
+    assert not recorder._should_explain("insert", {"insert": "complaint_items"})
+
+
+def test_explain_is_off_unless_enabled():
+    recorder = SlowQueryRecorder()
+    recorder._loop, recorder._db = object(), object()
+    recorder.explain = False
+
+    assert not recorder._should_explain("find", {"find": "complaint_items"})
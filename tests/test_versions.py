@@ -0,0 +1,68 @@
+import pytest
+
+from backend.mongodb_service.app.core.versions import VersionCounters
+
+
+@pytest.fixture
+def versions():
+    return VersionCounters("test", maxsize=10)
+
+
+def test_etag_is_weak_and_carries_the_epoch(versions):
+    assert versions.etag("k") == f'W/"{versions.epoch}-0"'
+
+
+def test_bump_moves_only_the_bumped_keys(versions):
+    a, b = versions.version("a"), versions.version("b")
+    versions.bump("a")
+
+    assert versions.version("a") > a
+    assert versions.version("b") == b
+
+
+def test_unremembered_key_is_pinned_until_bumped():
+    versions = VersionCounters("test", maxsize=2)
+    versions.bump("x")
+    versions.bump("y")
+    versions.bump("z")                  # evicts "x"
+
+    pinned = versions.version("x")
+    assert pinned == versions.sequence
+    versions.bump("y")
+    assert versions.version("x") == pinned
+
+
+def test_reset_changes_every_tag(versions):
+    before = versions.etag("k")
+    versions.reset()
+    assert versions.etag("k") != before
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        'W/"{tag}"',
+        '"{tag}"',                          # weak comparison ignores W/
+        '"other", W/"{tag}"',               # list
+        ' "other" ,W/"{tag}" ',
+        "*",
+    ],
+)
+def test_matches(versions, header):
+    etag = versions.etag("k")
+    tag = etag.removeprefix("W/").strip('"')
+
+    assert versions.matches(header.format(tag=tag), etag)
+    assert versions.not_modified == 1
+
+
+@pytest.mark.parametrize("header", [None, "", '"other"', 'W/"other", "also-other"'])
+def test_no_match(versions, header):
+    assert not versions.matches(header, versions.etag("k"))
+    assert versions.not_modified == 0
+
+
+def test_tag_from_another_process_does_not_match(versions):
+    # Same key, same version, different epoch (e.g. before a restart)
+    restarted = VersionCounters("test", maxsize=10)
+    assert not restarted.matches(versions.etag("k"), restarted.etag("k"))
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from backend.mongodb_service.app.mongodb.write_queue import WriteQueue
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class RecordingFlush:
+    """flush callback that records every batch and answers from a table."""
+
+    def __init__(self, results=None, error=None):
+        self.batches = []
+        self.results = results or {}
+        self.error = error
+
+    async def __call__(self, batch):
+        self.batches.append(batch)
+        if self.error:
+            raise self.error
+        return {key: self.results.get(key, True) for key in batch}
+
+
+def test_changes_to_one_key_merge_and_share_the_result():
+    async def scenario():
+        flush = RecordingFlush()
+        queue = WriteQueue("test", flush, max_batch=10, max_delay=0.01)
+
+        first = queue.submit("c1", {"status": "In Progress"})
+        second = queue.submit("c1", {"assigned_to": "a@x.com"})
+        third = queue.submit("c1", {"status": "Resolved"})
+
+        assert await asyncio.gather(first, second, third) == [True, True, True]
+        assert flush.batches == [{"c1": {"status": "Resolved", "assigned_to": "a@x.com"}}]
+        assert (queue.submitted, queue.merged, queue.flushes, queue.flushed_keys) == (3, 2, 1, 1)
+
+    run(scenario())
+
+
+def test_full_batch_flushes_without_waiting_for_the_timer():
+    async def scenario():
+        flush = RecordingFlush()
+        queue = WriteQueue("test", flush, max_batch=2, max_delay=60)
+
+        futures = [queue.submit(key, {"status": "Closed"}) for key in ("a", "b", "c")]
+        await asyncio.wait_for(asyncio.gather(*futures[:2]), 1)
+
+        assert flush.batches == [{"a": {"status": "Closed"}, "b": {"status": "Closed"}}]
+        assert not futures[2].done()
+        await queue.drain()
+        assert flush.batches[1] == {"c": {"status": "Closed"}}
+
+    run(scenario())
+
+
+def test_per_key_results_and_exceptions():
+    async def scenario():
+        failure = RuntimeError("write failed")
+        flush = RecordingFlush(results={"missing": False, "broken": failure})
+        queue = WriteQueue("test", flush, max_batch=10, max_delay=0)
+
+        ok = queue.submit("ok", {"status": "Pending"})
+        missing = queue.submit("missing", {"status": "Pending"})
+        broken = queue.submit("broken", {"status": "Pending"})
+
+        assert await ok is True
+        assert await missing is False
+        with pytest.raises(RuntimeError):
+            await broken
+
+    run(scenario())
+
+
+def test_flush_exception_fails_every_future_of_the_batch():
+    async def scenario():
+        queue = WriteQueue("test", RecordingFlush(error=ValueError("down")), max_batch=10, max_delay=0)
+        futures = [queue.submit(key, {"status": "Pending"}) for key in ("a", "b")]
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+
+    run(scenario())
+
+
+def test_cancelled_caller_does_not_break_the_flush():
+    async def scenario():
+        flush = RecordingFlush()
+        queue = WriteQueue("test", flush, max_batch=10, max_delay=0.01)
+
+        gone = queue.submit("c1", {"status": "Closed"})
+        kept = queue.submit("c1", {"assigned_to": "a@x.com"})
+        gone.cancel()
+
+        assert await kept is True
+        assert len(flush.batches) == 1
+
+    run(scenario())
+
+
+def test_drain_flushes_pending_and_waits_for_flushes_in_flight():
+    async def scenario():
+        release = asyncio.Event()
+        batches = []
+
+        async def slow_flush(batch):
+            batches.append(batch)
+            await release.wait()
+            return {key: True for key in batch}
+
+        queue = WriteQueue("test", slow_flush, max_batch=1, max_delay=60)
+        in_flight = queue.submit("a", {"status": "Closed"})    # full batch, flush starts
+        pending = queue.submit("b", {"status": "Closed"})
+
+        drain = asyncio.ensure_future(queue.drain())
+        await asyncio.sleep(0)
+        assert not drain.done()
+
+        release.set()
+        await asyncio.wait_for(drain, 1)
+        assert in_flight.done() and pending.done()
+        assert batches == [{"a": {"status": "Closed"}}, {"b": {"status": "Closed"}}]
+
+    run(scenario())
+
+
+def test_flushes_run_one_at_a_time_in_submission_order():
+    async def scenario():
+        order = []
+
+        async def flush(batch):
+            order.append(("start", dict(batch)))
+            await asyncio.sleep(0.01)
+            order.append(("end", dict(batch)))
+            return {key: True for key in batch}
+
+        queue = WriteQueue("test", flush, max_batch=1, max_delay=60)
+        first = queue.submit("c1", {"status": "In Progress"})
+        second = queue.submit("c1", {"status": "Resolved"})
+        await asyncio.gather(first, second)
+
+        assert order == [
+            ("start", {"c1": {"status": "In Progress"}}),
+            ("end", {"c1": {"status": "In Progress"}}),
+            ("start", {"c1": {"status": "Resolved"}}),
+            ("end", {"c1": {"status": "Resolved"}}),
+        ]
+
+    run(scenario())